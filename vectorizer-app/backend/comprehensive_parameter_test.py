@@ -6,7 +6,7 @@ Tests parameter processing with proper test images and fixed potrace options
 
 import asyncio
 import io
-import hashlib
+import zlib
 import os
 from PIL import Image, ImageDraw, ImageFilter
 import numpy as np
@@ -15,51 +15,64 @@ sys.path.append(os.path.dirname(__file__))
 
 from main import VectorizerService
 
+try:
+    import pyspng
+except ImportError:
+    pyspng = None
+
+# Fixed seed so fixture images, and therefore SVG hashes, are reproducible across runs
+rng = np.random.default_rng(0)
+
+def encode_png(img):
+    """Encode a PIL image as PNG, using libspng directly when available"""
+    img = img.convert('RGB')
+    if pyspng is not None:
+        return pyspng.encode(np.asarray(img), compress_level=1)
+
+    img_bytes = io.BytesIO()
+    img.save(img_bytes, format='PNG', compress_level=1)
+    return img_bytes.getvalue()
+
 async def test_fixed_parameters():
     """Test parameters with the fixed implementation"""
     vectorizer = VectorizerService()
 
     def svg_hash(svg):
-        return hashlib.md5(svg.encode()).hexdigest()[:8]
+        return f"{zlib.crc32(svg.encode()):08x}"
+
+    def summarize(svg):
+        """Return (hash, path count, size in bytes) from a single encode of the SVG"""
+        data = svg.encode()
+        return f"{zlib.crc32(data):08x}", svg.count('<path'), len(data)
 
     def create_noisy_image():
         """Create an image with noise to test turdsize properly"""
-        img = Image.new('RGB', (200, 200), 'white')
-        draw = ImageDraw.Draw(img)
+        arr = np.full((200, 200, 3), 255, np.uint8)
 
-        # Main shapes
-        draw.rectangle([50, 50, 150, 150], fill='black')
-        draw.ellipse([75, 75, 125, 125], fill='white')
+        # Main shapes: a black square with a white disc punched out of it
+        arr[50:151, 50:151] = 0
+        ys, xs = np.ogrid[:200, :200]
+        arr[(xs - 100)**2 + (ys - 100)**2 <= 25**2] = 255
 
-        # Add noise/speckles
-        for i in range(100):
-            x = np.random.randint(0, 200)
-            y = np.random.randint(0, 200)
-            size = np.random.randint(1, 4)
-            draw.rectangle([x, y, x+size, y+size], fill='black')
+        # Add noise/speckles; draw all coordinates in one batch, then blit
+        xs = rng.integers(0, 200, 100)
+        ys = rng.integers(0, 200, 100)
+        sizes = rng.integers(1, 4, 100)
+        for x, y, size in zip(xs, ys, sizes):
+            arr[y:y+size+1, x:x+size+1] = 0
 
-        # Convert to bytes
-        img_bytes = io.BytesIO()
-        img.save(img_bytes, format='PNG')
-        return img_bytes.getvalue()
+        img = Image.fromarray(arr)
+        return encode_png(img)
 
     def create_gradient_image():
         """Create an image with gradients for threshold testing"""
-        # Create a gradient image for better threshold testing
-        img = Image.new('L', (200, 200))
-        for x in range(200):
-            for y in range(200):
-                # Create circular gradient
-                center_x, center_y = 100, 100
-                distance = ((x - center_x)**2 + (y - center_y)**2)**0.5
-                intensity = max(0, 255 - int(distance * 2))
-                img.putpixel((x, y), intensity)
-
-        # Convert to RGB and then to bytes
-        img = img.convert('RGB')
-        img_bytes = io.BytesIO()
-        img.save(img_bytes, format='PNG')
-        return img_bytes.getvalue()
+        # Circular gradient centred on (100, 100), computed for all pixels at once
+        ys, xs = np.ogrid[:200, :200]
+        distance = np.sqrt((xs - 100)**2 + (ys - 100)**2)
+        intensity = np.clip(255 - (distance * 2).astype(np.int16), 0, 255).astype(np.uint8)
+        img = Image.fromarray(intensity)
+
+        return encode_png(img)
 
     def create_edge_rich_image():
         """Create an image with various edge types"""
@@ -71,21 +84,19 @@ async def test_fixed_parameters():
         draw.ellipse([80, 20, 120, 60], fill='black')       # Curved edges
         draw.polygon([(140, 20), (180, 40), (160, 60), (150, 40)], fill='black')  # Angular
 
-        # Add some fine details
-        for i in range(10):
-            x = 20 + i * 15
-            draw.line([(x, 80), (x, 100)], fill='black', width=1)
+        arr = np.array(img)
 
-        # Add gradient-like area
-        for i in range(50):
-            gray_val = i * 5
-            if gray_val < 256:
-                color = (gray_val, gray_val, gray_val)
-                draw.rectangle([20 + i, 120, 21 + i, 170], fill=color)
+        # Add some fine details: ten 1px vertical lines
+        arr[80:101, 20 + np.arange(10) * 15] = 0
 
-        img_bytes = io.BytesIO()
-        img.save(img_bytes, format='PNG')
-        return img_bytes.getvalue()
+        # Add gradient-like area: one gray level per column, the last band two pixels wide
+        grays = np.arange(50, dtype=np.uint8) * 5
+        arr[120:171, 20:70] = grays[None, :, None]
+        arr[120:171, 70] = grays[-1]
+
+        img = Image.fromarray(arr)
+
+        return encode_png(img)
 
     print("COMPREHENSIVE PARAMETER VALIDATION TEST")
     print("=" * 60)
@@ -95,16 +106,19 @@ async def test_fixed_parameters():
     noisy_image = create_noisy_image()
 
     try:
-        svg1 = await vectorizer.potrace_vectorize(noisy_image, turdsize=0)
-        svg2 = await vectorizer.potrace_vectorize(noisy_image, turdsize=10)
-        svg3 = await vectorizer.potrace_vectorize(noisy_image, turdsize=50)
+        svg1, svg2, svg3 = await asyncio.gather(
+            vectorizer.potrace_vectorize(noisy_image, turdsize=0),
+            vectorizer.potrace_vectorize(noisy_image, turdsize=10),
+            vectorizer.potrace_vectorize(noisy_image, turdsize=50),
+        )
 
-        hash1, hash2, hash3 = svg_hash(svg1), svg_hash(svg2), svg_hash(svg3)
-        paths1, paths2, paths3 = svg1.count('<path'), svg2.count('<path'), svg3.count('<path')
+        hash1, paths1, size1 = summarize(svg1)
+        hash2, paths2, size2 = summarize(svg2)
+        hash3, paths3, size3 = summarize(svg3)
 
-        print(f"   turdsize=0:  {hash1} ({paths1} paths, {len(svg1)} chars)")
-        print(f"   turdsize=10: {hash2} ({paths2} paths, {len(svg2)} chars)")
-        print(f"   turdsize=50: {hash3} ({paths3} paths, {len(svg3)} chars)")
+        print(f"   turdsize=0:  {hash1} ({paths1} paths, {size1} bytes)")
+        print(f"   turdsize=10: {hash2} ({paths2} paths, {size2} bytes)")
+        print(f"   turdsize=50: {hash3} ({paths3} paths, {size3} bytes)")
 
         unique_results = len(set([hash1, hash2, hash3]))
         if unique_results >= 2:
@@ -119,12 +133,13 @@ async def test_fixed_parameters():
     print("\n2. Testing Potrace turnpolicy:")
     try:
         policies = ['black', 'white', 'left', 'right', 'minority', 'majority']
-        results = []
+        svgs = await asyncio.gather(*[
+            vectorizer.potrace_vectorize(noisy_image, turnpolicy=policy)
+            for policy in policies
+        ])
+        results = [svg_hash(svg) for svg in svgs]
 
-        for policy in policies:
-            svg = await vectorizer.potrace_vectorize(noisy_image, turnpolicy=policy)
-            hash_val = svg_hash(svg)
-            results.append(hash_val)
+        for policy, hash_val in zip(policies, results):
             print(f"   turnpolicy={policy:8}: {hash_val}")
 
         unique_policies = len(set(results))
@@ -136,9 +151,11 @@ async def test_fixed_parameters():
     # Test 3: Potrace alphamax (corner threshold)
     print("\n3. Testing Potrace alphamax (corner threshold):")
     try:
-        svg1 = await vectorizer.potrace_vectorize(noisy_image, alphamax=0.0)   # Sharp corners
-        svg2 = await vectorizer.potrace_vectorize(noisy_image, alphamax=1.0)   # Default
-        svg3 = await vectorizer.potrace_vectorize(noisy_image, alphamax=2.0)   # Smooth corners
+        svg1, svg2, svg3 = await asyncio.gather(
+            vectorizer.potrace_vectorize(noisy_image, alphamax=0.0),  # Sharp corners
+            vectorizer.potrace_vectorize(noisy_image, alphamax=1.0),  # Default
+            vectorizer.potrace_vectorize(noisy_image, alphamax=2.0),  # Smooth corners
+        )
 
         hash1, hash2, hash3 = svg_hash(svg1), svg_hash(svg2), svg_hash(svg3)
         print(f"   alphamax=0.0: {hash1}")
@@ -157,12 +174,15 @@ async def test_fixed_parameters():
     # Test 4: Potrace opticurve
     print("\n4. Testing Potrace opticurve (curve optimization):")
     try:
-        svg1 = await vectorizer.potrace_vectorize(noisy_image, opticurve=True)
-        svg2 = await vectorizer.potrace_vectorize(noisy_image, opticurve=False)
+        svg1, svg2 = await asyncio.gather(
+            vectorizer.potrace_vectorize(noisy_image, opticurve=True),
+            vectorizer.potrace_vectorize(noisy_image, opticurve=False),
+        )
 
-        hash1, hash2 = svg_hash(svg1), svg_hash(svg2)
-        print(f"   opticurve=True:  {hash1} ({len(svg1)} chars)")
-        print(f"   opticurve=False: {hash2} ({len(svg2)} chars)")
+        hash1, _, size1 = summarize(svg1)
+        hash2, _, size2 = summarize(svg2)
+        print(f"   opticurve=True:  {hash1} ({size1} bytes)")
+        print(f"   opticurve=False: {hash2} ({size2} bytes)")
 
         if hash1 != hash2:
             print("   ✅ PASS: opticurve produces different results")
@@ -175,11 +195,13 @@ async def test_fixed_parameters():
     # Test 5: Potrace invert
     print("\n5. Testing Potrace invert:")
     try:
-        svg1 = await vectorizer.potrace_vectorize(noisy_image, invert=False)
-        svg2 = await vectorizer.potrace_vectorize(noisy_image, invert=True)
+        svg1, svg2 = await asyncio.gather(
+            vectorizer.potrace_vectorize(noisy_image, invert=False),
+            vectorizer.potrace_vectorize(noisy_image, invert=True),
+        )
 
-        hash1, hash2 = svg_hash(svg1), svg_hash(svg2)
-        paths1, paths2 = svg1.count('<path'), svg2.count('<path')
+        hash1, paths1, _ = summarize(svg1)
+        hash2, paths2, _ = summarize(svg2)
         print(f"   invert=False: {hash1} ({paths1} paths)")
         print(f"   invert=True:  {hash2} ({paths2} paths)")
 
@@ -196,12 +218,15 @@ async def test_fixed_parameters():
     gradient_image = create_gradient_image()
 
     try:
-        svg1 = await vectorizer.opencv_edge_vectorize(gradient_image, low_threshold=20, high_threshold=60)
-        svg2 = await vectorizer.opencv_edge_vectorize(gradient_image, low_threshold=80, high_threshold=160)
-        svg3 = await vectorizer.opencv_edge_vectorize(gradient_image, low_threshold=120, high_threshold=200)
+        svg1, svg2, svg3 = await asyncio.gather(
+            vectorizer.opencv_edge_vectorize(gradient_image, low_threshold=20, high_threshold=60),
+            vectorizer.opencv_edge_vectorize(gradient_image, low_threshold=80, high_threshold=160),
+            vectorizer.opencv_edge_vectorize(gradient_image, low_threshold=120, high_threshold=200),
+        )
 
-        hash1, hash2, hash3 = svg_hash(svg1), svg_hash(svg2), svg_hash(svg3)
-        paths1, paths2, paths3 = svg1.count('<path'), svg2.count('<path'), svg3.count('<path')
+        hash1, paths1, _ = summarize(svg1)
+        hash2, paths2, _ = summarize(svg2)
+        hash3, paths3, _ = summarize(svg3)
 
         print(f"   Low thresholds:    {hash1} ({paths1} paths)")
         print(f"   Medium thresholds: {hash2} ({paths2} paths)")
@@ -219,12 +244,15 @@ async def test_fixed_parameters():
     # Test 7: OpenCV Contour with gradient image
     print("\n7. Testing OpenCV Contour threshold with gradient image:")
     try:
-        svg1 = await vectorizer.opencv_contour_vectorize(gradient_image, threshold=80)
-        svg2 = await vectorizer.opencv_contour_vectorize(gradient_image, threshold=140)
-        svg3 = await vectorizer.opencv_contour_vectorize(gradient_image, threshold=200)
+        svg1, svg2, svg3 = await asyncio.gather(
+            vectorizer.opencv_contour_vectorize(gradient_image, threshold=80),
+            vectorizer.opencv_contour_vectorize(gradient_image, threshold=140),
+            vectorizer.opencv_contour_vectorize(gradient_image, threshold=200),
+        )
 
-        hash1, hash2, hash3 = svg_hash(svg1), svg_hash(svg2), svg_hash(svg3)
-        paths1, paths2, paths3 = svg1.count('<path'), svg2.count('<path'), svg3.count('<path')
+        hash1, paths1, _ = summarize(svg1)
+        hash2, paths2, _ = summarize(svg2)
+        hash3, paths3, _ = summarize(svg3)
 
         print(f"   threshold=80:  {hash1} ({paths1} paths)")
         print(f"   threshold=140: {hash2} ({paths2} paths)")
@@ -244,12 +272,15 @@ async def test_fixed_parameters():
     edge_rich_image = create_edge_rich_image()
 
     try:
-        svg1 = await vectorizer.opencv_edge_vectorize(edge_rich_image, min_area=10)
-        svg2 = await vectorizer.opencv_edge_vectorize(edge_rich_image, min_area=100)
-        svg3 = await vectorizer.opencv_edge_vectorize(edge_rich_image, min_area=500)
-
-        hash1, hash2, hash3 = svg_hash(svg1), svg_hash(svg2), svg_hash(svg3)
-        paths1, paths2, paths3 = svg1.count('<path'), svg2.count('<path'), svg3.count('<path')
+        svg1, svg2, svg3 = await asyncio.gather(
+            vectorizer.opencv_edge_vectorize(edge_rich_image, min_area=10),
+            vectorizer.opencv_edge_vectorize(edge_rich_image, min_area=100),
+            vectorizer.opencv_edge_vectorize(edge_rich_image, min_area=500),
+        )
+
+        hash1, paths1, _ = summarize(svg1)
+        hash2, paths2, _ = summarize(svg2)
+        hash3, paths3, _ = summarize(svg3)
 
         print(f"   min_area=10:  {hash1} ({paths1} paths)")
         print(f"   min_area=100: {hash2} ({paths2} paths)")
@@ -8,12 +8,24 @@ import io
 import subprocess
 import tempfile
 import os
-from PIL import Image, ImageDraw
+import re
+from PIL import Image, ImageDraw, ImageOps
 import sys
 sys.path.append(os.path.dirname(__file__))
 
 from main import VectorizerService
 
+_RE_PATH_TAG = re.compile(rb'<path\b')
+
+_SVG_HEADER = '''<?xml version="1.0" encoding="UTF-8"?>
+<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">
+'''
+
+def svg_stats(svg_content):
+    """Return (size in bytes, number of <path> elements) from one encode of the SVG"""
+    data = svg_content.encode()
+    return len(data), len(_RE_PATH_TAG.findall(data))
+
 async def debug_potrace_parameters():
     """Debug Potrace parameter processing"""
     print("=" * 50)
@@ -72,8 +84,8 @@ async def debug_potrace_parameters():
             with open(temp_svg2_path, 'r') as f:
                 svg2_content = f.read()
 
-            print(f"Direct potrace turdsize=0:  length={len(svg1_content)}, paths={svg1_content.count('<path')}")
-            print(f"Direct potrace turdsize=10: length={len(svg2_content)}, paths={svg2_content.count('<path')}")
+            print("Direct potrace turdsize=0:  length=%d bytes, paths=%d" % svg_stats(svg1_content))
+            print("Direct potrace turdsize=10: length=%d bytes, paths=%d" % svg_stats(svg2_content))
 
             if svg1_content != svg2_content:
                 print("✅ Direct potrace calls with different turdsize produce different results")
@@ -107,7 +119,7 @@ async def debug_potrace_parameters():
 
         if kwargs.get('invert', False):
             print("DEBUG: Applying image inversion")
-            img = Image.eval(img, lambda x: 255 - x)
+            img = ImageOps.invert(img)
 
         img.save(temp_bmp_path)
 
@@ -153,7 +165,7 @@ async def debug_potrace_parameters():
         with open(temp_svg_path, 'r') as f:
             svg_content = f.read()
 
-        print(f"DEBUG: SVG length: {len(svg_content)}, paths: {svg_content.count('<path')}")
+        print("DEBUG: SVG length: %d bytes, paths: %d" % svg_stats(svg_content))
 
         # Cleanup
         for path in [temp_input_path, temp_svg_path, temp_bmp_path]:
@@ -171,8 +183,8 @@ async def debug_potrace_parameters():
         svg2 = await vectorizer.potrace_vectorize(test_image, turdsize=10)
 
         print(f"\nResult comparison:")
-        print(f"turdsize=0:  {len(svg1)} chars, {svg1.count('<path')} paths")
-        print(f"turdsize=10: {len(svg2)} chars, {svg2.count('<path')} paths")
+        print("turdsize=0:  %d bytes, %d paths" % svg_stats(svg1))
+        print("turdsize=10: %d bytes, %d paths" % svg_stats(svg2))
 
         if svg1 != svg2:
             print("✅ Our method: turdsize produces different results")
@@ -238,9 +250,7 @@ async def debug_opencv_parameters():
         print(f"DEBUG: Found {len(contours)} contours")
 
         height, width = gray.shape
-        svg_content = f'''<?xml version="1.0" encoding="UTF-8"?>
-<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">
-'''
+        parts = [_SVG_HEADER.format(width=width, height=height)]
 
         # Process contours with minimum area filter
         min_area = kwargs.get('min_area', 50)
@@ -257,14 +267,14 @@ async def debug_opencv_parameters():
                 approx = cv2.approxPolyDP(contour, epsilon, True)
 
                 if len(approx) > 2:
-                    path_data = f"M {approx[0][0][0]},{approx[0][0][1]}"
-                    for point in approx[1:]:
-                        path_data += f" L {point[0][0]},{point[0][1]}"
-                    path_data += " Z"
+                    # (N, 1, 2) int32 -> flat (N, 2) coordinate pairs, serialized in one join
+                    pts = approx.reshape(-1, 2).tolist()
+                    path_data = "M " + " L ".join(f"{x},{y}" for x, y in pts) + " Z"
 
-                    svg_content += f'<path d="{path_data}" fill="none" stroke="black" stroke-width="{stroke_width}"/>\n'
+                    parts.append(f'<path d="{path_data}" fill="none" stroke="black" stroke-width="{stroke_width}"/>\n')
 
-        svg_content += '</svg>'
+        parts.append('</svg>')
+        svg_content = ''.join(parts)
 
         print(f"DEBUG: Valid contours after filtering (min_area={min_area}): {valid_contours}")
         print(f"DEBUG: Final SVG length: {len(svg_content)}")
@@ -280,8 +290,8 @@ async def debug_opencv_parameters():
         svg2 = await vectorizer.opencv_edge_vectorize(test_image, low_threshold=100, high_threshold=200)
 
         print(f"\nResult comparison:")
-        print(f"Low thresholds:  {len(svg1)} chars, {svg1.count('<path')} paths")
-        print(f"High thresholds: {len(svg2)} chars, {svg2.count('<path')} paths")
+        print("Low thresholds:  %d bytes, %d paths" % svg_stats(svg1))
+        print("High thresholds: %d bytes, %d paths" % svg_stats(svg2))
 
         if svg1 != svg2:
             print("✅ OpenCV edge: thresholds produce different results")
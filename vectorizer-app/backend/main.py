@@ -1,57 +1,102 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, Form, Request
+from fastapi import FastAPI, UploadFile, File, HTTPException, Form, Request, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse, Response
-from fastapi.exceptions import RequestValidationError
-from starlette.exceptions import HTTPException as StarletteHTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.formparsers import MultiPartParser
 from PIL import Image
 import io
-import base64
-import subprocess
 import os
-import tempfile
-import uuid
+import shutil
+import logging
+import logging.handlers
+import queue
+import sys
+import hashlib
+import asyncio
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import vtracer
 import re
+import orjson
+import numpy as np
+from typing import List, Literal, Union
+from pydantic import BaseModel, ConfigDict, Field, StrictBool, ValidationError
+
+logger = logging.getLogger(__name__)
+logger.setLevel(os.getenv("LOG_LEVEL", "WARNING").upper())
+
+# While the app is running, records go through a queue and a background thread
+# does the stderr write, so logging on error paths never blocks the event loop
+_log_listener = None
+_log_queue_handler = None
+
+def start_log_listener():
+    global _log_listener, _log_queue_handler
+    if _log_listener is not None:
+        return
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    _log_listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    _log_listener.start()
+    _log_queue_handler = logging.handlers.QueueHandler(log_queue)
+    logger.addHandler(_log_queue_handler)
+    logger.propagate = False
+
+def stop_log_listener():
+    global _log_listener, _log_queue_handler
+    if _log_listener is None:
+        return
+    logger.removeHandler(_log_queue_handler)
+    logger.propagate = True
+    _log_listener.stop()
+    _log_listener = None
+    _log_queue_handler = None
+
+# Resolve the potrace CLI once at import instead of searching PATH on every exec
+POTRACE_BIN = shutil.which('potrace') or 'potrace'
+
+# Optional in-process Potrace bindings (pypotrace); fall back to the potrace CLI without them
+try:
+    import potrace as potrace_lib
+except ImportError:
+    potrace_lib = None
+
+if potrace_lib is not None:
+    POTRACE_TURNPOLICIES = {
+        'black': potrace_lib.TURNPOLICY_BLACK,
+        'white': potrace_lib.TURNPOLICY_WHITE,
+        'left': potrace_lib.TURNPOLICY_LEFT,
+        'right': potrace_lib.TURNPOLICY_RIGHT,
+        'minority': potrace_lib.TURNPOLICY_MINORITY,
+        'majority': potrace_lib.TURNPOLICY_MAJORITY,
+        'random': potrace_lib.TURNPOLICY_RANDOM,
+    }
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson; SVG payloads make encoder speed matter"""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_log_listener()
+    await warm_executor()
+    yield
+    shutdown_executor()
+    stop_log_listener()
 
-app = FastAPI(title="Image Vectorizer API")
+app = FastAPI(title="Image Vectorizer API", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # Configure CORS from environment
 allowed_origins_env = os.getenv("ALLOWED_ORIGINS", "http://localhost:5173,https://tracer-frontend-z5u3.onrender.com")
 allowed_origins = [o.strip() for o in allowed_origins_env.split(",") if o.strip()]
 
-# Custom middleware to ensure CORS headers on ALL responses (even errors)
-class CORSEnforcerMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        try:
-            response = await call_next(request)
-        except Exception as e:
-            # Catch any exception and create a response with CORS headers
-            origin = request.headers.get("origin")
-            cors_origin = origin if origin in allowed_origins else (allowed_origins[0] if allowed_origins else "*")
-            response = JSONResponse(
-                status_code=500,
-                content={"detail": "Internal server error"},
-                headers={
-                    "Access-Control-Allow-Origin": cors_origin,
-                    "Access-Control-Allow-Credentials": "true",
-                }
-            )
-        
-        # Ensure CORS headers are on the response
-        origin = request.headers.get("origin")
-        cors_origin = origin if origin in allowed_origins else (allowed_origins[0] if allowed_origins else "*")
-        
-        # Add CORS headers if not present
-        if "Access-Control-Allow-Origin" not in response.headers:
-            response.headers["Access-Control-Allow-Origin"] = cors_origin
-            response.headers["Access-Control-Allow-Credentials"] = "true"
-        
-        return response
-
-# Add CORS enforcer middleware FIRST (runs last in reverse order)
-app.add_middleware(CORSEnforcerMiddleware)
+# Browsers may reuse a preflight for this many seconds instead of re-sending
+# OPTIONS before every upload
+CORS_MAX_AGE = int(os.getenv("CORS_MAX_AGE", "86400"))
 
 # Standard CORS middleware
 app.add_middleware(
@@ -60,45 +105,20 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=CORS_MAX_AGE,
 )
 
-# Exception handlers to ensure CORS headers on all error responses
-@app.exception_handler(HTTPException)
-async def http_exception_handler(request: Request, exc: HTTPException):
-    """Ensure HTTPException responses include CORS headers"""
-    origin = request.headers.get("origin")
-    cors_origin = origin if origin in allowed_origins else (allowed_origins[0] if allowed_origins else "*")
-    
-    return JSONResponse(
-        status_code=exc.status_code,
-        content={"detail": exc.detail},
-        headers={
-            "Access-Control-Allow-Origin": cors_origin,
-            "Access-Control-Allow-Credentials": "true",
-        }
-    )
-
-@app.exception_handler(StarletteHTTPException)
-async def starlette_exception_handler(request: Request, exc: StarletteHTTPException):
-    """Ensure StarletteHTTPException responses include CORS headers"""
-    origin = request.headers.get("origin")
-    cors_origin = origin if origin in allowed_origins else (allowed_origins[0] if allowed_origins else "*")
-    
-    return JSONResponse(
-        status_code=exc.status_code,
-        content={"detail": exc.detail},
-        headers={
-            "Access-Control-Allow-Origin": cors_origin,
-            "Access-Control-Allow-Credentials": "true",
-        }
-    )
+# SVG path data compresses roughly 10x; small responses aren't worth the CPU
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
+# HTTPException responses come from Starlette's ExceptionMiddleware, inside
+# CORSMiddleware, so they already get CORS headers. Unhandled exceptions are
+# answered by ServerErrorMiddleware outside it, so add the headers here.
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     """Catch-all exception handler with CORS headers"""
-    import traceback
-    traceback.print_exc()
-    
+    logger.error("Unhandled error on %s %s", request.method, request.url.path, exc_info=exc)
+
     origin = request.headers.get("origin")
     cors_origin = origin if origin in allowed_origins else (allowed_origins[0] if allowed_origins else "*")
     
@@ -115,323 +135,452 @@ class ParameterValidationError(ValueError):
     """Custom exception for parameter validation errors"""
     pass
 
+_VALID_TURNPOLICIES = ('black', 'white', 'left', 'right', 'minority', 'majority', 'random')
+_TURNPOLICY_NAMES = ', '.join(_VALID_TURNPOLICIES)
+
+# Accepts ints, floats and numeric strings from HTML range/select inputs,
+# keeping ints as ints ("6" -> 6, "6.5" -> 6.5)
+Number = Union[int, float]
+
+class PotraceParams(BaseModel):
+    """Potrace parameters; keys other than these pass through untouched"""
+    model_config = ConfigDict(extra='allow')
+
+    turdsize: Number = Field(2, ge=0, le=100)
+    turnpolicy: Literal[_VALID_TURNPOLICIES] = 'minority'
+    alphamax: Number = Field(1.0, ge=0, le=2.0)
+    invert: StrictBool = False
+    opticurve: StrictBool = True
+
+class VTracerParams(BaseModel):
+    """VTracer parameters; keys other than these pass through untouched"""
+    model_config = ConfigDict(extra='allow')
+
+    colormode: Literal['color', 'binary'] = 'color'
+    color_precision: Number = Field(6, ge=1, le=8)
+    filter_speckle: Number = Field(4, ge=1, le=100)
+    corner_threshold: Number = Field(60, ge=0, le=180)
+    length_threshold: Number = Field(4.0, ge=0.0, le=50.0)
+    max_iterations: Number = Field(10, ge=1, le=100)
+    splice_threshold: Number = Field(45, ge=0, le=180)
+    path_precision: Number = Field(2, ge=1, le=10)
+
+# Error messages per field, by failure kind ('type' is the fallback)
+_POTRACE_MESSAGES = {
+    'turdsize': {'type': "turdsize must be a number between 0 and 100"},
+    'alphamax': {'type': "alphamax must be a number between 0.0 and 2.0"},
+    'turnpolicy': {'type': f"turnpolicy must be one of: {_TURNPOLICY_NAMES}"},
+    'invert': {'type': "invert must be a boolean"},
+    'opticurve': {'type': "opticurve must be a boolean"},
+}
+
+_VTRACER_MESSAGES = {
+    'colormode': {'type': "colormode must be one of: color, binary"},
+    **{
+        name: {
+            'type': f"{name} must be a int or float",
+            'range': f"{name} must be between {low} and {high}",
+        }
+        for name, (low, high) in {
+            'color_precision': (1, 8),
+            'filter_speckle': (1, 100),
+            'corner_threshold': (0, 180),
+            'length_threshold': (0.0, 50.0),
+            'max_iterations': (1, 100),
+            'splice_threshold': (0, 180),
+            'path_precision': (1, 10),
+        }.items()
+    },
+}
+
+def _validation_message(exc: ValidationError, messages: dict) -> str:
+    """Translate the first pydantic error into this API's error message"""
+    error = exc.errors()[0]
+    if not error['loc']:
+        # Not tied to one field (e.g. the whole block failed to validate)
+        return f"Invalid parameters: {error['msg']}"
+    field = error['loc'][0]
+    if error['type'].endswith('_parsing') and isinstance(error['input'], str):
+        return f"{field} must be a valid number"
+    field_messages = messages[field]
+    if error['type'] in ('greater_than_equal', 'less_than_equal'):
+        return field_messages.get('range', field_messages['type'])
+    return field_messages['type']
+
+def _validate_params(model, messages: dict, params: dict, method: str):
+    # The coerced values are written back into params, so it must be a dict
+    if not isinstance(params, dict):
+        raise ParameterValidationError(f"{method} parameters must be an object")
+    try:
+        validated = model.model_validate(params)
+    except ValidationError as e:
+        raise ParameterValidationError(_validation_message(e, messages)) from None
+    # Write coerced values back so parameters_used reports what actually ran
+    params.update(validated.model_dump(exclude_unset=True))
+
 def validate_potrace_params(params):
     """Validate Potrace parameters with proper bounds checking"""
-    # Convert string numbers to actual numbers for HTML range/select inputs
-    if 'turdsize' in params and isinstance(params['turdsize'], str):
-        try:
-            params['turdsize'] = int(params['turdsize']) if '.' not in params['turdsize'] else float(params['turdsize'])
-        except (ValueError, TypeError):
-            raise ParameterValidationError("turdsize must be a valid number")
-
-    if 'alphamax' in params and isinstance(params['alphamax'], str):
-        try:
-            params['alphamax'] = float(params['alphamax'])
-        except (ValueError, TypeError):
-            raise ParameterValidationError("alphamax must be a valid number")
-
-    if 'turdsize' in params:
-        if not isinstance(params['turdsize'], (int, float)) or params['turdsize'] < 0 or params['turdsize'] > 100:
-            raise ParameterValidationError("turdsize must be a number between 0 and 100")
+    _validate_params(PotraceParams, _POTRACE_MESSAGES, params, 'potrace')
 
-    if 'alphamax' in params:
-        if not isinstance(params['alphamax'], (int, float)) or params['alphamax'] < 0 or params['alphamax'] > 2.0:
-            raise ParameterValidationError("alphamax must be a number between 0.0 and 2.0")
+def validate_vtracer_params(params):
+    """Validate VTracer parameters with proper bounds checking"""
+    _validate_params(VTracerParams, _VTRACER_MESSAGES, params, 'vtracer')
+
+def potrace_path_to_svg(plist, width: int, height: int) -> str:
+    """Render a pypotrace path list as a single even-odd filled SVG path"""
+    parts = []
+    for curve in plist:
+        x, y = curve.start_point
+        parts.append(f"M{x:.3f} {y:.3f}")
+        for segment in curve.segments:
+            if segment.is_corner:
+                cx, cy = segment.c
+                ex, ey = segment.end_point
+                parts.append(f"L{cx:.3f} {cy:.3f}L{ex:.3f} {ey:.3f}")
+            else:
+                c1x, c1y = segment.c1
+                c2x, c2y = segment.c2
+                ex, ey = segment.end_point
+                parts.append(f"C{c1x:.3f} {c1y:.3f} {c2x:.3f} {c2y:.3f} {ex:.3f} {ey:.3f}")
+        parts.append("Z")
+
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" version="1.1" viewBox="0 0 {width} {height}">'
+        f'<path fill="#000000" fill-rule="evenodd" d="{"".join(parts)}"/>'
+        '</svg>'
+    )
 
-    if 'turnpolicy' in params:
-        valid_policies = ['black', 'white', 'left', 'right', 'minority', 'majority', 'random']
-        if params['turnpolicy'] not in valid_policies:
-            raise ParameterValidationError(f"turnpolicy must be one of: {', '.join(valid_policies)}")
+# Tracer output carries comments, metadata and layout whitespace the browser never needs
+_SVG_COMMENT = re.compile(r'<!--.*?-->', re.DOTALL)
+_SVG_METADATA = re.compile(r'<metadata>.*?</metadata>', re.DOTALL)
+_SVG_INTERTAG_SPACE = re.compile(r'>\s+<')
+# Only applied inside element tags, so quotes in text, CDATA or <style> keep their spacing
+_SVG_ELEMENT_TAG = re.compile(r'<[^!?>][^>]*>')
+_SVG_TRAILING_ATTR_SPACE = re.compile(r'\s+"')
+
+# normalize_svg_dimensions runs on every tracer output; compile its patterns once.
+# Only the root tag is rewritten, so sizing attributes on inner elements
+# (stroke-width, <rect width=...>) are left alone.
+_SVG_ROOT_TAG = re.compile(r'<svg\b[^>]*>')
+_SVG_SIZE_ATTRS = re.compile(r'\s+(?:width|height|viewBox)="[^"]*"')
+
+def minify_svg(svg_content: str) -> str:
+    """Strip comments, metadata and redundant whitespace from traced SVG"""
+    svg_content = _SVG_COMMENT.sub('', svg_content)
+    svg_content = _SVG_METADATA.sub('', svg_content)
+    svg_content = _SVG_INTERTAG_SPACE.sub('><', svg_content)
+    svg_content = _SVG_ELEMENT_TAG.sub(lambda m: _SVG_TRAILING_ATTR_SPACE.sub('"', m.group(0)), svg_content)
+    return svg_content.strip()
+
+def open_for_tracing(image_bytes: bytes, max_edge):
+    """Open an upload, shrinking it so its longer edge is at most max_edge.
+
+    Returns (image, original_size). Tracing cost grows faster than pixel count,
+    so big uploads are traced at reduced size and scaled back up in the SVG.
+    """
+    img = Image.open(io.BytesIO(image_bytes))
+    original_size = img.size
+    if max_edge and max(original_size) > max_edge:
+        img.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+    return img, original_size
+
+def potrace_bitmap(image_bytes: bytes, invert: bool, max_edge=None):
+    """Decode to grayscale and threshold to a boolean foreground mask (True = black).
+
+    Returns (bitmap, original_size).
+    """
+    img, original_size = open_for_tracing(image_bytes, max_edge)
+    pixels = np.asarray(img.convert('L'))
+
+    # Dark pixels are foreground, matching potrace's default 0.5 black level.
+    # Inverting just flips the comparison, so no extra pass over the pixels.
+    return (pixels >= 128 if invert else pixels < 128), original_size
+
+# Tracing workers. These are top-level so they can be pickled into the process pool;
+# each returns (svg, original_size, traced_size) and leaves normalization to the caller.
+
+def potrace_bindings_worker(image_bytes: bytes, invert, turdsize, turnpolicy, alphamax, opticurve, max_edge=None):
+    """Trace with the pypotrace bindings, entirely in memory"""
+    bitmap, original_size = potrace_bitmap(image_bytes, invert, max_edge)
+    height, width = bitmap.shape
+
+    plist = potrace_lib.Bitmap(bitmap).trace(
+        turdsize=turdsize,
+        turnpolicy=POTRACE_TURNPOLICIES[turnpolicy],
+        alphamax=alphamax,
+        opticurve=opticurve,
+    )
+    return potrace_path_to_svg(plist, width, height), original_size, (width, height)
+
+def potrace_pbm(image_bytes: bytes, invert, max_edge=None):
+    """Build the potrace CLI input. Returns (pbm_bytes, original_size, traced_size)"""
+    bitmap, original_size = potrace_bitmap(image_bytes, invert, max_edge)
+    height, width = bitmap.shape
+
+    # Hand potrace a raw PBM (P4): 1 bit per pixel, rows padded to whole bytes, 1 = black
+    pbm = f"P4\n{width} {height}\n".encode() + np.packbits(bitmap, axis=1).tobytes()
+    return pbm, original_size, (width, height)
+
+# Tweaking turdsize/alphamax/etc. in the UI re-traces the same upload, and the
+# PBM only depends on the image, invert and max_edge. Keep the last few PBMs
+# (not the uploads) keyed by the request's image digest so those retraces skip
+# the decode and threshold.
+PBM_CACHE_SIZE = int(os.getenv("PBM_CACHE_SIZE", "8"))
+pbm_cache = OrderedDict()
+
+async def load_potrace_pbm(image_bytes: bytes, invert, max_edge=None, digest=None):
+    """potrace_pbm off the event loop, through pbm_cache when a digest is given"""
+    key = (digest, invert, max_edge)
+    if digest is not None and key in pbm_cache:
+        pbm_cache.move_to_end(key)
+        return pbm_cache[key]
+
+    result = await asyncio.to_thread(potrace_pbm, image_bytes, invert, max_edge)
+    if digest is not None and PBM_CACHE_SIZE > 0:
+        pbm_cache[key] = result
+        if len(pbm_cache) > PBM_CACHE_SIZE:
+            pbm_cache.popitem(last=False)
+    return result
+
+def potrace_command(turdsize, turnpolicy, alphamax, opticurve) -> list:
+    """potrace CLI arguments; the bitmap is read from stdin and SVG written to stdout"""
+    cmd = [POTRACE_BIN, '-s', '--svg', '--output', '-']
+
+    # Add turdsize (filter small speckles)
+    cmd.extend(['--turdsize', str(turdsize)])
+
+    # Add turn policy
+    cmd.extend(['--turnpolicy', turnpolicy])
+
+    # Add corner threshold
+    cmd.extend(['--alphamax', str(alphamax)])
+
+    # Add curve optimization
+    if not opticurve:
+        cmd.append('--longcurve')  # Turn off curve optimization
+
+    cmd.append('-')
+    return cmd
+
+def vtracer_worker(image_bytes: bytes, colormode, color_precision, filter_speckle, corner_threshold, length_threshold, max_iterations, splice_threshold, path_precision, max_edge=None):
+    """Trace with VTracer from an in-memory PNG"""
+    # Always convert to PNG for VTracer compatibility
+    # VTracer's Rust library has issues with some JPEG files, so we
+    # standardize on PNG format regardless of input format. The PNG only
+    # lives in memory, so favour encode speed over size.
+    try:
+        img, original_size = open_for_tracing(image_bytes, max_edge)
+        traced_size = img.size
 
-    if 'invert' in params:
-        if not isinstance(params['invert'], bool):
-            raise ParameterValidationError("invert must be a boolean")
+        if img.format == 'PNG' and img.mode == 'RGB' and traced_size == original_size:
+            # Already exactly what we would produce: hand the upload over as-is
+            # (PIL has only read the header), skipping a decode and re-encode
+            png_bytes = image_bytes
+        else:
+            img = img.convert('RGB')  # Ensure RGB mode for consistent PNG output
+            png_buf = io.BytesIO()
+            img.save(png_buf, 'PNG', compress_level=1)
+            png_bytes = png_buf.getvalue()
+        img.close()
+    except Exception as e:
+        raise Exception(f"Failed to convert image to PNG format: {str(e)}")
+
+    svg_content = vtracer.convert_raw_image_to_svg(
+        png_bytes,
+        img_format='png',
+        colormode=colormode,
+        color_precision=color_precision,
+        filter_speckle=filter_speckle,
+        corner_threshold=corner_threshold,
+        length_threshold=length_threshold,
+        max_iterations=max_iterations,
+        splice_threshold=splice_threshold,
+        path_precision=path_precision
+    )
+    return svg_content, original_size, traced_size
+
+# Worker pool for CPU-bound tracing so it never blocks the event loop. Created on
+# first use (TestClient without a context manager never runs startup hooks).
+# VECTORIZE_POOL=thread trades GIL isolation for no pickling and one shared
+# process, which suits small single-core containers.
+VECTORIZE_WORKERS = int(os.getenv("VECTORIZE_WORKERS", str(os.cpu_count() or 1)))
+VECTORIZE_POOL = os.getenv("VECTORIZE_POOL", "process").lower()
+_executor = None
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        if VECTORIZE_POOL == "thread":
+            _executor = ThreadPoolExecutor(max_workers=VECTORIZE_WORKERS, thread_name_prefix="vectorize")
+        else:
+            _executor = ProcessPoolExecutor(max_workers=VECTORIZE_WORKERS)
+    return _executor
 
-    if 'opticurve' in params:
-        if not isinstance(params['opticurve'], bool):
-            raise ParameterValidationError("opticurve must be a boolean")
+def _warm_worker():
+    return os.getpid()
 
-def validate_vtracer_params(params):
-    """Validate VTracer parameters with proper bounds checking"""
-    validations = {
-        'colormode': {'type': str, 'values': ['color', 'binary']},
-        'color_precision': {'type': (int, float), 'range': (1, 8), 'convert': True},
-        'filter_speckle': {'type': (int, float), 'range': (1, 100), 'convert': True},
-        'corner_threshold': {'type': (int, float), 'range': (0, 180), 'convert': True},
-        'length_threshold': {'type': (int, float), 'range': (0.0, 50.0), 'convert': True},
-        'max_iterations': {'type': (int, float), 'range': (1, 100), 'convert': True},
-        'splice_threshold': {'type': (int, float), 'range': (0, 180), 'convert': True},
-        'path_precision': {'type': (int, float), 'range': (1, 10), 'convert': True}
-    }
+async def warm_executor():
+    """Start every pool worker up front so the first requests don't pay for
+    process spawn and module import"""
+    loop = asyncio.get_running_loop()
+    executor = get_executor()
+    await asyncio.gather(*[loop.run_in_executor(executor, _warm_worker) for _ in range(VECTORIZE_WORKERS)])
 
-    for param, validation in validations.items():
-        if param in params:
-            value = params[param]
-
-            # Convert string numbers to actual numbers for HTML range inputs
-            if validation.get('convert') and isinstance(value, str):
-                try:
-                    # Try int first, then float
-                    if '.' in value:
-                        value = float(value)
-                    else:
-                        value = int(value)
-                    # Update the params dict with converted value
-                    params[param] = value
-                except (ValueError, TypeError):
-                    raise ParameterValidationError(f"{param} must be a valid number")
-
-            # Type checking
-            if 'type' in validation:
-                if isinstance(validation['type'], tuple):
-                    if not isinstance(value, validation['type']):
-                        raise ParameterValidationError(f"{param} must be a {' or '.join([t.__name__ for t in validation['type']])}")
-                else:
-                    if not isinstance(value, validation['type']):
-                        raise ParameterValidationError(f"{param} must be a {validation['type'].__name__}")
-
-            # Value checking
-            if 'values' in validation:
-                if value not in validation['values']:
-                    raise ParameterValidationError(f"{param} must be one of: {', '.join(validation['values'])}")
-
-            # Range checking
-            if 'range' in validation:
-                min_val, max_val = validation['range']
-                if not (min_val <= value <= max_val):
-                    raise ParameterValidationError(f"{param} must be between {min_val} and {max_val}")
+def shutdown_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
 
 class VectorizerService:
     def __init__(self):
         pass
 
-    def normalize_svg_dimensions(self, svg_content: str, original_width: int, original_height: int) -> str:
-        """Normalize SVG dimensions to consistent scaling with viewBox only (no explicit width/height)"""
-        try:
-            # Remove explicit width and height attributes to allow CSS scaling to work properly
-            svg_content = re.sub(r'\s*width="[^"]*"', '', svg_content)
-            svg_content = re.sub(r'\s*height="[^"]*"', '', svg_content)
+    def normalize_svg_dimensions(self, svg_content: str, original_width: int, original_height: int, traced_width: int = None, traced_height: int = None) -> str:
+        """Normalize SVG dimensions to consistent scaling with viewBox only (no explicit width/height).
 
-            # Ensure viewBox is present and matches original dimensions
-            viewbox_pattern = r'viewBox="[^"]*"'
-            new_viewbox = f'viewBox="0 0 {original_width} {original_height}"'
-
-            if 'viewBox=' in svg_content:
-                svg_content = re.sub(viewbox_pattern, new_viewbox, svg_content)
-            else:
-                # Add viewBox after the opening svg tag
-                svg_content = re.sub(r'(<svg[^>]*)', f'\\1 {new_viewbox}', svg_content)
-
-            return svg_content
+        When the image was traced at a reduced size, the content is wrapped in a
+        scale group so the viewBox still matches the original dimensions.
+        """
+        try:
+            root = _SVG_ROOT_TAG.search(svg_content)
+            if root is None:
+                return minify_svg(svg_content)
+
+            # Drop explicit width/height so CSS scaling works, and set a viewBox
+            # matching the original dimensions. Only the short root tag is
+            # rewritten; the body is spliced back in with a single copy.
+            tag = _SVG_SIZE_ATTRS.sub('', root.group(0)[:-1])
+            new_tag = f'{tag} viewBox="0 0 {original_width} {original_height}">'
+            closing = ''
+
+            if traced_width and traced_height and (traced_width, traced_height) != (original_width, original_height):
+                sx = original_width / traced_width
+                sy = original_height / traced_height
+                new_tag += f'<g transform="scale({sx:.6g} {sy:.6g})">'
+                closing = '</g>'
+
+            body = svg_content[root.end():]
+            if closing:
+                head, sep, tail = body.rpartition('</svg>')
+                body = f'{head}{closing}{sep}{tail}'
+            svg_content = f'{svg_content[:root.start()]}{new_tag}{body}'
+
+            return minify_svg(svg_content)
 
         except Exception as e:
-            print(f"Warning: SVG normalization failed: {e}")
+            logger.warning("SVG normalization failed: %s", e)
             return svg_content
 
-    async def potrace_vectorize(self, image_bytes: bytes, invert=False, turdsize=2, turnpolicy='minority', alphamax=1.0, opticurve=True) -> str:
-        """Vectorize using Potrace (traditional method) with enhanced options"""
-        try:
-            # Create temporary files
-            with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as temp_input:
-                temp_input.write(image_bytes)
-                temp_input_path = temp_input.name
+    async def potrace_vectorize(self, image_bytes: bytes, invert=False, turdsize=2, turnpolicy='minority', alphamax=1.0, opticurve=True, max_edge=None, digest=None) -> str:
+        """Vectorize using Potrace (traditional method) with enhanced options.
 
-            temp_svg_path = temp_input_path.replace('.png', '.svg')
-            temp_bmp_path = temp_input_path.replace('.png', '.bmp')
-
-            # Convert to BMP and optionally invert
-            img = Image.open(temp_input_path).convert('L')  # Convert to grayscale
-            original_width, original_height = img.size
-
-            if invert:
-                # Invert the image (white becomes black, black becomes white)
-                img = Image.eval(img, lambda x: 255 - x)
-
-            img.save(temp_bmp_path)
-
-            # Build potrace command with parameters
-            cmd = ['potrace', '-s', '--svg', '--output', temp_svg_path]
-
-            # Add turdsize (filter small speckles)
-            cmd.extend(['--turdsize', str(turdsize)])
-
-            # Add turn policy
-            cmd.extend(['--turnpolicy', turnpolicy])
-
-            # Add corner threshold
-            cmd.extend(['--alphamax', str(alphamax)])
-
-            # Add curve optimization
-            if not opticurve:
-                cmd.append('--longcurve')  # Turn off curve optimization
-
-
-            cmd.append(temp_bmp_path)
-
-            
-
-            # Run potrace
-            result = subprocess.run(cmd, capture_output=True, text=True)
+        Passing the image digest lets repeat traces of the same image reuse its PBM.
+        """
+        try:
+            if potrace_lib is not None:
+                loop = asyncio.get_running_loop()
+                svg_content, original_size, traced_size = await loop.run_in_executor(
+                    get_executor(), potrace_bindings_worker,
+                    image_bytes, invert, turdsize, turnpolicy, alphamax, opticurve, max_edge
+                )
+            else:
+                pbm, original_size, traced_size = await load_potrace_pbm(image_bytes, invert, max_edge, digest)
+
+                # Run potrace without blocking the event loop while it traces
+                proc = await asyncio.create_subprocess_exec(
+                    *potrace_command(turdsize, turnpolicy, alphamax, opticurve),
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+                stdout, stderr = await proc.communicate(pbm)
 
-            if result.returncode != 0:
-                raise Exception(f"Potrace failed: {result.stderr}")
+                if proc.returncode != 0:
+                    raise Exception(f"Potrace failed: {stderr.decode(errors='replace')}")
 
-            # Read SVG content
-            with open(temp_svg_path, 'r') as f:
-                svg_content = f.read()
+                svg_content = stdout.decode()
 
             # Normalize SVG dimensions for consistent scaling
-            svg_content = self.normalize_svg_dimensions(svg_content, original_width, original_height)
-
-            # Cleanup
-            for path in [temp_input_path, temp_svg_path, temp_bmp_path]:
-                if os.path.exists(path):
-                    os.unlink(path)
-
-            return svg_content
+            return self.normalize_svg_dimensions(svg_content, *original_size, *traced_size)
 
         except Exception as e:
             # Raise the actual error instead of silently falling back
             raise Exception(f"Potrace processing failed: {str(e)}")
 
-    async def vtracer_vectorize(self, image_bytes: bytes, colormode='color', color_precision=6, filter_speckle=4, corner_threshold=60, length_threshold=4.0, max_iterations=10, splice_threshold=45, path_precision=3) -> str:
+    async def vtracer_vectorize(self, image_bytes: bytes, colormode='color', color_precision=6, filter_speckle=4, corner_threshold=60, length_threshold=4.0, max_iterations=10, splice_threshold=45, path_precision=2, max_edge=None) -> str:
         """Vectorize using VTracer (advanced color-preserving method)"""
-        temp_input_path = None
-        temp_svg_path = None
         try:
-            # Use standard Python file writing (more compatible with Rust FFI)
-            # Write to /tmp explicitly to ensure visibility
-            temp_dir = '/tmp'
-            if not os.path.exists(temp_dir):
-                temp_dir = tempfile.gettempdir()
-            
-            # Always convert to PNG for VTracer compatibility
-            # VTracer's Rust library has issues with some JPEG files, so we
-            # standardize on PNG format regardless of input format
-            unique_id = str(uuid.uuid4())
-            temp_input_path = os.path.join(temp_dir, f'vtracer_input_{unique_id}.png')
-            temp_svg_path = os.path.join(temp_dir, f'vtracer_output_{unique_id}.svg')
-
-            # Convert to PNG using PIL to ensure VTracer compatibility
-            try:
-                img = Image.open(io.BytesIO(image_bytes))
-                img = img.convert('RGB')  # Ensure RGB mode for consistent PNG output
-                img.save(temp_input_path, 'PNG', optimize=True)
-                img.close()
-            except Exception as e:
-                raise Exception(f"Failed to convert image to PNG format: {str(e)}")
-
-            # Ensure file is written and accessible
-            
-            # Set explicit permissions - ensure file is readable by all (Rust might run as different user)
-            os.chmod(temp_input_path, 0o644)  # rw-r--r--
-            
-            # Convert to absolute paths using realpath to resolve any symlinks
-            temp_input_path = os.path.realpath(os.path.abspath(temp_input_path))
-            # Build svg path from base name regardless of input extension
-            base_no_ext = os.path.splitext(temp_input_path)[0]
-            temp_svg_path = os.path.abspath(f"{base_no_ext}.svg")
-
-            # Verify file exists, is readable, and has content with absolute path
-            if not os.path.exists(temp_input_path):
-                raise Exception(f"Temporary input file was not created: {temp_input_path}")
-            
-            if not os.path.isfile(temp_input_path):
-                raise Exception(f"Path exists but is not a file: {temp_input_path}")
-            
-            if not os.access(temp_input_path, os.R_OK):
-                raise Exception(f"File is not readable: {temp_input_path}")
-            
-            file_size = os.path.getsize(temp_input_path)
-            if file_size == 0:
-                raise Exception(f"Temporary input file is empty: {temp_input_path}")
-
-            # Note: We don't validate file size against original since we convert formats
-            # (JPG -> PNG conversion changes file size)
-
-            # Get original image dimensions - verify image is valid
-            try:
-                img = Image.open(temp_input_path)
-                img.verify()  # Verify it's a valid image
-                img = Image.open(temp_input_path)  # Reopen after verify
-                original_width, original_height = img.size
-                img.close()
-            except Exception as e:
-                raise Exception(f"Invalid image file: {str(e)}")
-
-            # Final verification before calling vtracer - ensure file is still there
-            if not os.path.exists(temp_input_path) or not os.access(temp_input_path, os.R_OK):
-                raise Exception(f"File disappeared or became unreadable before vtracer call: {temp_input_path}")
-
-            # File has been validated - exists, readable, non-empty, and valid image format
-
-            # Convert using VTracer with absolute paths
-            # Ensure paths are strings (not Path objects) for Rust compatibility
-            vtracer_input_path = str(temp_input_path)
-            vtracer_output_path = str(temp_svg_path)
-            
-            # Final debug check - log to stderr (more reliable than print in some environments)
-            import sys
-            sys.stderr.write(f"DEBUG: VTracer input path: {vtracer_input_path}\n")
-            sys.stderr.write(f"DEBUG: VTracer output path: {vtracer_output_path}\n")
-            sys.stderr.write(f"DEBUG: Input file exists: {os.path.exists(vtracer_input_path)}\n")
-            sys.stderr.write(f"DEBUG: Input file readable: {os.access(vtracer_input_path, os.R_OK)}\n")
-            sys.stderr.write(f"DEBUG: Input file size: {os.path.getsize(vtracer_input_path)}\n")
-            sys.stderr.write(f"DEBUG: Input file permissions: {oct(os.stat(vtracer_input_path).st_mode)}\n")
-            sys.stderr.write(f"DEBUG: Current working directory: {os.getcwd()}\n")
-            sys.stderr.flush()
-            
-            # Try calling vtracer with the resolved path
-            # If it still fails, wrap in try/except to get better error message
-            try:
-                vtracer.convert_image_to_svg_py(
-                    vtracer_input_path,
-                    vtracer_output_path,
-                    colormode=colormode,
-                    color_precision=color_precision,
-                    filter_speckle=filter_speckle,
-                    corner_threshold=corner_threshold,
-                    length_threshold=length_threshold,
-                    max_iterations=max_iterations,
-                    splice_threshold=splice_threshold,
-                    path_precision=path_precision
-                )
-            except Exception as vtracer_error:
-                # Log detailed error information
-                sys.stderr.write(f"DEBUG: VTracer error type: {type(vtracer_error).__name__}\n")
-                sys.stderr.write(f"DEBUG: VTracer error message: {str(vtracer_error)}\n")
-                sys.stderr.flush()
-                raise Exception(f"VTracer failed with path '{vtracer_input_path}': {str(vtracer_error)}")
-
-            # Read SVG content
-            with open(temp_svg_path, 'r') as f:
-                svg_content = f.read()
+            loop = asyncio.get_running_loop()
+            svg_content, original_size, traced_size = await loop.run_in_executor(
+                get_executor(), vtracer_worker, image_bytes, colormode, color_precision, filter_speckle,
+                corner_threshold, length_threshold, max_iterations, splice_threshold, path_precision, max_edge
+            )
 
             # Normalize SVG dimensions for consistent scaling
-            svg_content = self.normalize_svg_dimensions(svg_content, original_width, original_height)
-
-            # Cleanup
-            for path in [temp_input_path, temp_svg_path]:
-                if path and os.path.exists(path):
-                    try:
-                        os.unlink(path)
-                    except:
-                        pass  # Ignore cleanup errors
-
-            return svg_content
+            return self.normalize_svg_dimensions(svg_content, *original_size, *traced_size)
 
         except Exception as e:
-            # Ensure cleanup on error
-            for path in [temp_input_path, temp_svg_path]:
-                if path and os.path.exists(path):
-                    try:
-                        os.unlink(path)
-                    except:
-                        pass  # Ignore cleanup errors
             raise Exception(f"VTracer processing failed: {str(e)}")
 
 vectorizer = VectorizerService()
 
+# LRU cache of traced SVGs keyed by (image digest, method, params); repeat
+# requests from the UI tweaking one parameter at a time skip re-tracing
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "256"))
+result_cache = OrderedDict()
+
+# Admission control for tracing: caps how many potrace/vtracer jobs run at once
+# so a burst of large uploads queues instead of oversubscribing cores and RAM.
+# Cache hits never wait on it. Created per event loop because a semaphore binds
+# to the first loop that waits on it (each TestClient runs its own loop).
+VECTORIZE_CONCURRENCY = int(os.getenv("VECTORIZE_CONCURRENCY", str(os.cpu_count() or 1)))
+_vectorize_semaphore = None
+_vectorize_semaphore_loop = None
+
+def get_vectorize_semaphore() -> asyncio.Semaphore:
+    global _vectorize_semaphore, _vectorize_semaphore_loop
+    loop = asyncio.get_running_loop()
+    if _vectorize_semaphore is None or _vectorize_semaphore_loop is not loop:
+        _vectorize_semaphore = asyncio.Semaphore(VECTORIZE_CONCURRENCY)
+        _vectorize_semaphore_loop = loop
+    return _vectorize_semaphore
+
+def image_digest(image_bytes: bytes) -> bytes:
+    """Content hash used to key the result cache"""
+    return hashlib.blake2b(image_bytes, digest_size=16).digest()
+
+async def run_vectorizer(method: str, image_bytes: bytes, digest: bytes, method_params: dict, max_edge=None):
+    """Run one vectorization method through the result cache.
+
+    Returns (svg_or_error, cache_hit). Errors are returned as "Error: ..." strings
+    and never cached.
+    """
+    # Params are JSON from the request, and extra keys may hold lists or dicts,
+    # so key on their canonical serialization rather than hashing the values
+    key = (digest, method, max_edge, orjson.dumps(method_params, option=orjson.OPT_SORT_KEYS))
+    cached = result_cache.get(key)
+    if cached is not None:
+        result_cache.move_to_end(key)
+        logger.debug("%s result served from cache", method)
+        return cached, True
+
+    try:
+        async with get_vectorize_semaphore():
+            if method == 'potrace':
+                svg = await vectorizer.potrace_vectorize(image_bytes, max_edge=max_edge, digest=digest, **method_params)
+            else:
+                svg = await vectorizer.vtracer_vectorize(image_bytes, max_edge=max_edge, **method_params)
+    except Exception as e:
+        logger.debug("%s failed: %s", method, e)
+        return f"Error: {str(e)}", False
+
+    if RESULT_CACHE_SIZE > 0:
+        result_cache[key] = svg
+        if len(result_cache) > RESULT_CACHE_SIZE:
+            result_cache.popitem(last=False)
+    return svg, False
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint to verify server is awake and responsive"""
@@ -440,81 +589,137 @@ async def health_check():
 @app.options("/vectorize")
 async def vectorize_options():
     """Handle preflight OPTIONS request for /vectorize"""
-    from fastapi.responses import Response
-    return Response(status_code=200)
+    return Response(
+        status_code=204,
+        headers={
+            "Access-Control-Max-Age": str(CORS_MAX_AGE),
+            "Access-Control-Allow-Methods": "POST, OPTIONS",
+            "Access-Control-Allow-Headers": "*",
+        },
+    )
+
+MAX_FILE_SIZE = 20 * 1024 * 1024  # 20MB in bytes
+# Longest edge images are traced at; 0 disables downscaling. Overridable per request
+MAX_TRACE_EDGE = int(os.getenv("MAX_TRACE_EDGE", "1024"))
+MAX_BATCH_FILES = int(os.getenv("MAX_BATCH_FILES", "50"))
+ALLOWED_TYPES = ['image/png', 'image/jpeg', 'image/gif']
+# Signatures of the allowed formats; content_type is client-controlled, these bytes are not
+IMAGE_MAGIC = (b'\x89PNG\r\n\x1a\n', b'\xff\xd8\xff', b'GIF87a', b'GIF89a')
+METHODS = ['potrace', 'vtracer']
+
+# Starlette spools uploads above 1MB to a disk-backed temp file; keep anything up
+# to the upload limit in RAM since read_upload reads it all into memory anyway
+MultiPartParser.spool_max_size = int(os.getenv("UPLOAD_SPOOL_MAX_SIZE", str(MAX_FILE_SIZE)))
+
+async def read_upload(file: UploadFile) -> bytes:
+    """Validate an upload and return its bytes.
+
+    Size and type are checked from the multipart headers first, so oversized or
+    unsupported files are rejected without being read off the spooled temp file.
+    """
+    if file.size is not None and file.size > MAX_FILE_SIZE:
+        raise HTTPException(status_code=400, detail="File size exceeds 20MB limit")
+
+    # Restrict to specific image types
+    if not file.content_type or file.content_type not in ALLOWED_TYPES:
+        raise HTTPException(status_code=400, detail="File must be PNG, JPEG, or GIF format")
+
+    # Sniff the signature before reading the rest, so junk never reaches PIL or a worker
+    header = await file.read(16)
+    if not header.startswith(IMAGE_MAGIC):
+        raise HTTPException(status_code=415, detail="File content is not a valid PNG, JPEG, or GIF image")
+    # Rewind past the sniffed header; with the raised spool size this is an in-memory seek
+    await file.seek(0)
+
+    # Bounded read: never buffer more than one byte past the limit, even when
+    # the size wasn't known up front
+    file_bytes = await file.read(MAX_FILE_SIZE + 1)
+    if len(file_bytes) > MAX_FILE_SIZE:
+        raise HTTPException(status_code=400, detail="File size exceeds 20MB limit")
+    return file_bytes
+
+def parse_parameters(parameters: str) -> dict:
+    """Parse and validate the JSON parameters form field"""
+    try:
+        params = orjson.loads(parameters) if parameters != "{}" else {}
+    except orjson.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON in parameters: {str(e)}")
+
+    # Validate parameters
+    if 'potrace' in params:
+        validate_potrace_params(params['potrace'])
+    if 'vtracer' in params:
+        validate_vtracer_params(params['vtracer'])
+
+    return params
+
+def select_methods(selected_method: str, params: dict) -> list:
+    """All available methods, or just the selected one if specified.
+
+    When both are requested for binary line art (vtracer colormode 'binary' and
+    potrace left at its defaults), potrace is skipped: its output would be
+    near-identical, and the frontend fetches it on demand if the user switches
+    method. The frontend always sends a full potrace block, so "unset" means
+    "no value differs from the default", not "absent".
+    """
+    if selected_method and selected_method in METHODS:
+        return [selected_method]
+    potrace_customised = PotraceParams.model_validate(params.get('potrace', {})).model_dump(exclude_defaults=True)
+    if params.get('vtracer', {}).get('colormode') == 'binary' and not potrace_customised:
+        return ['vtracer']
+    return METHODS
+
+async def vectorize_methods(image_bytes: bytes, digest: bytes, params: dict, methods: list, max_edge=None):
+    """Run each method (concurrently, through the cache) and return (results, cache_hits)"""
+    outcomes = await asyncio.gather(*[
+        run_vectorizer(method, image_bytes, digest, params.get(method, {}), max_edge)
+        for method in methods
+    ])
+    results = {}
+    cache_hits = {}
+    for method, (result, hit) in zip(methods, outcomes):
+        results[method] = result
+        cache_hits[method] = hit
+    return results, cache_hits
 
 @app.post("/vectorize")
-async def vectorize_image(file: UploadFile = File(...), parameters: str = Form("{}"), selected_method: str = Form("")):
-    """Vectorize an uploaded image using multiple methods with parameters"""
+async def vectorize_image(file: UploadFile = File(...), parameters: str = Form("{}"), selected_method: str = Form(""), max_edge: int = Query(MAX_TRACE_EDGE, ge=0), raw: bool = Query(False)):
+    """Vectorize an uploaded image using multiple methods with parameters.
+
+    With ?raw=true and a single selected_method, the SVG itself is returned as
+    image/svg+xml instead of the JSON envelope.
+    """
     try:
-        # Check file size (20MB limit)
-        MAX_FILE_SIZE = 20 * 1024 * 1024  # 20MB in bytes
-        file_bytes = await file.read()
+        if raw and selected_method not in METHODS:
+            raise HTTPException(status_code=400, detail="raw output requires a selected_method")
 
-        if len(file_bytes) > MAX_FILE_SIZE:
-            raise HTTPException(status_code=400, detail="File size exceeds 20MB limit")
+        image_bytes = await read_upload(file)
+        params = parse_parameters(parameters)
 
-        # Restrict to specific image types
-        allowed_types = ['image/png', 'image/jpeg', 'image/gif']
-        if not file.content_type or file.content_type not in allowed_types:
-            raise HTTPException(status_code=400, detail="File must be PNG, JPEG, or GIF format")
+        digest = image_digest(image_bytes)
+        if raw:
+            svg, cache_hit = await run_vectorizer(
+                selected_method, image_bytes, digest, params.get(selected_method, {}), max_edge
+            )
+            if svg.startswith("Error: "):
+                raise HTTPException(status_code=500, detail=f"Processing failed: {svg.removeprefix('Error: ')}")
+            return Response(
+                content=svg,
+                media_type="image/svg+xml",
+                headers={"Content-Disposition": "inline", "X-Cache": "HIT" if cache_hit else "MISS"},
+            )
 
-        # Parse parameters
-        import json
-        try:
-            params = json.loads(parameters) if parameters != "{}" else {}
-        except json.JSONDecodeError as e:
-            raise HTTPException(status_code=400, detail=f"Invalid JSON in parameters: {str(e)}")
-
-        # Validate parameters
-        if 'potrace' in params:
-            validate_potrace_params(params['potrace'])
-        if 'vtracer' in params:
-            validate_vtracer_params(params['vtracer'])
-
-        image_bytes = file_bytes
-
-        # Process with all available methods (or just the selected one if specified)
-        results = {}
-
-        # If a specific method is requested, only process that one
-        if selected_method and selected_method in ['potrace', 'vtracer']:
-            if selected_method == 'potrace':
-                try:
-                    potrace_params = params.get('potrace', {})
-                    results['potrace'] = await vectorizer.potrace_vectorize(image_bytes, **potrace_params)
-                except Exception as e:
-                    results['potrace'] = f"Error: {str(e)}"
-            elif selected_method == 'vtracer':
-                try:
-                    vtracer_params = params.get('vtracer', {})
-                    results['vtracer'] = await vectorizer.vtracer_vectorize(image_bytes, **vtracer_params)
-                except Exception as e:
-                    results['vtracer'] = f"Error: {str(e)}"
-        else:
-            # Process both methods (default behavior)
-            # Process Potrace vectorization
-            try:
-                potrace_params = params.get('potrace', {})
-                results['potrace'] = await vectorizer.potrace_vectorize(image_bytes, **potrace_params)
-            except Exception as e:
-                results['potrace'] = f"Error: {str(e)}"
-
-            # Process VTracer vectorization
-            try:
-                vtracer_params = params.get('vtracer', {})
-                results['vtracer'] = await vectorizer.vtracer_vectorize(image_bytes, **vtracer_params)
-            except Exception as e:
-                results['vtracer'] = f"Error: {str(e)}"
-
-        # Convert original image to base64 for display
-        original_b64 = base64.b64encode(image_bytes).decode('utf-8')
-
-        return JSONResponse({
+        results, cache_hits = await vectorize_methods(
+            image_bytes, digest, params, select_methods(selected_method, params), max_edge
+        )
+
+        # The client already has the original image; echo only its content hash
+        return ORJSONResponse({
             'success': True,
-            'original_image': f"data:{file.content_type};base64,{original_b64}",
+            'original_hash': digest.hex(),
             'vectorized': results,
-            'parameters_used': params
+            'parameters_used': params,
+            'cache_hit': cache_hits
         })
 
     except HTTPException:
@@ -525,6 +730,61 @@ async def vectorize_image(file: UploadFile = File(...), parameters: str = Form("
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Processing failed: {str(e)}")
 
+@app.post("/vectorize_batch")
+async def vectorize_batch(files: List[UploadFile] = File(...), parameters: str = Form("{}"), selected_method: str = Form(""), max_edge: int = Query(MAX_TRACE_EDGE, ge=0)):
+    """Vectorize several images with one shared parameter set; results keep the upload order"""
+    try:
+        if len(files) > MAX_BATCH_FILES:
+            raise HTTPException(status_code=400, detail=f"Batch exceeds {MAX_BATCH_FILES} files")
+
+        uploads = []
+        for file in files:
+            uploads.append((file.filename, await read_upload(file)))
+        params = parse_parameters(parameters)
+        methods = select_methods(selected_method, params)
+
+        # Identical images in one batch are traced once and shared
+        jobs = {}
+        digests = []
+        for _, image_bytes in uploads:
+            digest = image_digest(image_bytes)
+            digests.append(digest)
+            if digest not in jobs:
+                jobs[digest] = vectorize_methods(image_bytes, digest, params, methods, max_edge)
+        outcomes = dict(zip(jobs.keys(), await asyncio.gather(*jobs.values())))
+
+        items = []
+        for (filename, _), digest in zip(uploads, digests):
+            results, cache_hits = outcomes[digest]
+            items.append({
+                'filename': filename,
+                'vectorized': results,
+                'cache_hit': cache_hits
+            })
+
+        return ORJSONResponse({
+            'success': True,
+            'results': items,
+            'parameters_used': params
+        })
+
+    except HTTPException:
+        raise
+    except ParameterValidationError as e:
+        raise HTTPException(status_code=400, detail=f"Parameter validation failed: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Processing failed: {str(e)}")
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # "auto" picks uvloop/httptools when installed (uvicorn[standard], not on
+    # Windows). Each web worker owns its own tracing pool and result cache, so
+    # scale WEB_CONCURRENCY with care on small instances.
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        loop="auto",
+        http="auto",
+    )
\ No newline at end of file
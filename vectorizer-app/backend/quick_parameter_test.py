@@ -6,7 +6,7 @@ Tests the most important parameters for each vectorization method
 
 import asyncio
 import io
-import hashlib
+import zlib
 from PIL import Image, ImageDraw
 import sys
 import os
@@ -29,7 +29,7 @@ async def quick_test():
     test_image = img_bytes.getvalue()
 
     def svg_hash(svg):
-        return hashlib.md5(svg.encode()).hexdigest()[:8]
+        return f"{zlib.crc32(svg.encode()):08x}"
 
     print("Quick Parameter Validation Test")
     print("=" * 40)
@@ -37,8 +37,10 @@ async def quick_test():
     # Test 1: Potrace turdsize parameter
     print("\n1. Testing Potrace turdsize parameter:")
     try:
-        svg1 = await vectorizer.potrace_vectorize(test_image, turdsize=0)
-        svg2 = await vectorizer.potrace_vectorize(test_image, turdsize=10)
+        svg1, svg2 = await asyncio.gather(
+            vectorizer.potrace_vectorize(test_image, turdsize=0),
+            vectorizer.potrace_vectorize(test_image, turdsize=10),
+        )
 
         hash1, hash2 = svg_hash(svg1), svg_hash(svg2)
         print(f"   turdsize=0:  {hash1} (length: {len(svg1)})")
@@ -54,8 +56,10 @@ async def quick_test():
     # Test 2: Potrace invert parameter
     print("\n2. Testing Potrace invert parameter:")
     try:
-        svg1 = await vectorizer.potrace_vectorize(test_image, invert=False)
-        svg2 = await vectorizer.potrace_vectorize(test_image, invert=True)
+        svg1, svg2 = await asyncio.gather(
+            vectorizer.potrace_vectorize(test_image, invert=False),
+            vectorizer.potrace_vectorize(test_image, invert=True),
+        )
 
         hash1, hash2 = svg_hash(svg1), svg_hash(svg2)
         print(f"   invert=False: {hash1}")
@@ -71,8 +75,10 @@ async def quick_test():
     # Test 3: OpenCV Edge threshold parameters
     print("\n3. Testing OpenCV Edge thresholds:")
     try:
-        svg1 = await vectorizer.opencv_edge_vectorize(test_image, low_threshold=30, high_threshold=100)
-        svg2 = await vectorizer.opencv_edge_vectorize(test_image, low_threshold=100, high_threshold=200)
+        svg1, svg2 = await asyncio.gather(
+            vectorizer.opencv_edge_vectorize(test_image, low_threshold=30, high_threshold=100),
+            vectorizer.opencv_edge_vectorize(test_image, low_threshold=100, high_threshold=200),
+        )
 
         hash1, hash2 = svg_hash(svg1), svg_hash(svg2)
         paths1 = svg1.count('<path')
@@ -91,8 +97,10 @@ async def quick_test():
     # Test 4: OpenCV Contour threshold parameter
     print("\n4. Testing OpenCV Contour threshold:")
     try:
-        svg1 = await vectorizer.opencv_contour_vectorize(test_image, threshold=50)
-        svg2 = await vectorizer.opencv_contour_vectorize(test_image, threshold=200)
+        svg1, svg2 = await asyncio.gather(
+            vectorizer.opencv_contour_vectorize(test_image, threshold=50),
+            vectorizer.opencv_contour_vectorize(test_image, threshold=200),
+        )
 
         hash1, hash2 = svg_hash(svg1), svg_hash(svg2)
         paths1 = svg1.count('<path')
@@ -111,8 +119,10 @@ async def quick_test():
     # Test 5: OpenCV Contour invert_threshold parameter
     print("\n5. Testing OpenCV Contour invert_threshold:")
     try:
-        svg1 = await vectorizer.opencv_contour_vectorize(test_image, invert_threshold=False)
-        svg2 = await vectorizer.opencv_contour_vectorize(test_image, invert_threshold=True)
+        svg1, svg2 = await asyncio.gather(
+            vectorizer.opencv_contour_vectorize(test_image, invert_threshold=False),
+            vectorizer.opencv_contour_vectorize(test_image, invert_threshold=True),
+        )
 
         hash1, hash2 = svg_hash(svg1), svg_hash(svg2)
         print(f"   invert=False: {hash1}")
@@ -1,38 +1,55 @@
 #!/usr/bin/env python3
 """Test runner script for the vectorizer backend."""
 import sys
-import subprocess
 import os
 from pathlib import Path
 
+import pytest
 
-def run_command(cmd, description):
-    """Run a command and handle errors."""
-    print(f"\n{'='*60}")
-    print(f"Running: {description}")
-    print(f"Command: {' '.join(cmd)}")
-    print(f"{'='*60}")
 
-    try:
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-        print(result.stdout)
-        if result.stderr:
-            print("STDERR:", result.stderr)
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"ERROR: {description} failed with exit code {e.returncode}")
-        print(f"STDOUT: {e.stdout}")
-        print(f"STDERR: {e.stderr}")
-        return False
-    except FileNotFoundError:
-        print(f"ERROR: Command not found. Make sure all dependencies are installed.")
-        return False
+class SectionBanners:
+    """Run tests grouped by marker and print a banner as each group starts.
+
+    Replaces the old one-subprocess-per-section loop: everything is collected
+    and run once, in one interpreter.
+    """
+
+    SECTIONS = [
+        ("unit", "Unit tests for VectorizerService"),
+        ("integration", "API integration tests"),
+        ("performance", "Performance tests"),
+        (None, "Other tests"),
+    ]
+
+    def __init__(self):
+        self.section_by_nodeid = {}
+        self.current = None
+
+    def section_of(self, item):
+        for index, (marker, _) in enumerate(self.SECTIONS):
+            if marker is None or item.get_closest_marker(marker):
+                return index
+
+    def pytest_collection_modifyitems(self, items):
+        # Stable sort keeps file/definition order within each section
+        items.sort(key=self.section_of)
+        for item in items:
+            self.section_by_nodeid[item.nodeid] = self.section_of(item)
+
+    def pytest_runtest_logstart(self, nodeid, location):
+        section = self.section_by_nodeid.get(nodeid)
+        if section != self.current:
+            self.current = section
+            print(f"\n{'='*60}")
+            print(f"Running: {self.SECTIONS[section][1]}")
+            print(f"{'='*60}")
 
 
 def main():
     """Main test runner."""
     print("🧪 Vectorizer Backend Test Suite")
     print("=" * 60)
+    print(f"pytest {pytest.__version__}")
 
     # Change to backend directory
     backend_dir = Path(__file__).parent
@@ -46,69 +63,39 @@ def main():
         print("   venv\\Scripts\\activate     # Windows")
         print()
 
-    success_count = 0
-    total_tests = 0
-
-    # Test configurations
-    test_configs = [
-        {
-            "cmd": ["python", "-m", "pytest", "--version"],
-            "description": "Checking pytest installation",
-            "required": True
-        },
-        {
-            "cmd": ["python", "-m", "pytest", "tests/", "-v", "--tb=short"],
-            "description": "Running all tests with verbose output",
-            "required": True
-        },
-        {
-            "cmd": ["python", "-m", "pytest", "tests/test_vectorizer_service.py", "-v", "-m", "unit"],
-            "description": "Running unit tests for VectorizerService",
-            "required": True
-        },
-        {
-            "cmd": ["python", "-m", "pytest", "tests/test_api_endpoints.py", "-v", "-m", "integration"],
-            "description": "Running API integration tests",
-            "required": True
-        },
-        {
-            "cmd": ["python", "-m", "pytest", "tests/test_parameter_system.py", "-v"],
-            "description": "Running parameter system tests",
-            "required": True
-        },
-        {
-            "cmd": ["python", "-m", "pytest", "tests/test_performance.py", "-v", "-m", "performance", "--tb=short"],
-            "description": "Running performance tests",
-            "required": False
-        },
-        {
-            "cmd": ["python", "-m", "pytest", "tests/", "--cov=main", "--cov-report=term-missing"],
-            "description": "Running tests with coverage report",
-            "required": False
-        }
-    ]
+    # --ff runs whatever failed last time first (from pytest's cache), so a
+    # broken case shows up in seconds; the rest of the suite still runs after
+    args = ["tests/", "-v", "--tb=short", "--ff"]
 
-    for config in test_configs:
-        total_tests += 1
-        success = run_command(config["cmd"], config["description"])
+    # Coverage is reported from the same run when pytest-cov is installed
+    try:
+        import pytest_cov  # noqa: F401
+        args += ["--cov=main", "--cov-report=term-missing"]
+        # On 3.12+ coverage can use PEP 669 monitoring instead of a per-line
+        # trace callback; older coverage/Python ignore this and use the C tracer
+        if sys.version_info >= (3, 12):
+            os.environ.setdefault("COVERAGE_CORE", "sysmon")
+    except ImportError:
+        print("⚠️  pytest-cov not installed, skipping coverage report")
+
+    # Fan test files out across cores when pytest-xdist is installed. Workers
+    # run whole files (loadfile) so module fixtures and the app import are
+    # shared within a file; section banners only make sense in a serial run.
+    plugins = []
+    try:
+        import xdist  # noqa: F401
+        args += ["-n", "auto", "--dist=loadfile"]
+    except ImportError:
+        plugins.append(SectionBanners())
 
-        if success:
-            success_count += 1
-            print(f"✅ {config['description']} - PASSED")
-        else:
-            print(f"❌ {config['description']} - FAILED")
-            if config["required"]:
-                print("⚠️  This is a required test. Consider fixing before continuing.")
+    exit_code = pytest.main(args, plugins=plugins)
 
     # Summary
     print(f"\n{'='*60}")
     print(f"📊 TEST SUMMARY")
     print(f"{'='*60}")
-    print(f"Total tests run: {total_tests}")
-    print(f"Passed: {success_count}")
-    print(f"Failed: {total_tests - success_count}")
 
-    if success_count == total_tests:
+    if exit_code == pytest.ExitCode.OK:
         print("🎉 All tests passed!")
         return 0
     else:
@@ -117,4 +104,4 @@ def main():
 
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(main())
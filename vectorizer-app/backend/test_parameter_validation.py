@@ -5,20 +5,58 @@ Tests that different parameter values produce visually different SVG outputs.
 """
 
 import asyncio
+import hashlib
 import io
 import json
-import hashlib
+import re
+import zlib
 import os
+import shelve
+import zipfile
+from collections import Counter
 from PIL import Image, ImageDraw
 import sys
 sys.path.append(os.path.dirname(__file__))
 
-from main import VectorizerService
+from main import VectorizerService, image_digest
+
+# Everything extract_svg_stats counts, found in one scan. Path commands are
+# matched as a bare letter between spaces so adjacent commands (" M L ") are
+# both counted, as the separate str.count calls did.
+SVG_TOKEN_RE = re.compile(r'<path|(?<= )[MLC](?= )|(?<= )Z')
+
+OUTPUT_DIR = '/tmp/vectorizer_test'
+SVG_ARCHIVE_PATH = os.path.join(OUTPUT_DIR, 'svgs.zip')
+
+
+def backend_version() -> str:
+    """Hash of main.py, mixed into disk cache keys so editing the backend
+    invalidates SVGs traced by the old code"""
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'main.py'), 'rb') as f:
+        return hashlib.blake2b(f.read(), digest_size=8).hexdigest()
 
 class ParameterTester:
     def __init__(self):
         self.vectorizer = VectorizerService()
         self.test_results = {}
+        # Traced SVGs keyed by (method, image digest, params), so a repeated
+        # combination is only traced once; one lock per key so concurrent
+        # duplicates wait for the first instead of tracing again
+        self._svg_cache = {}
+        self._svg_locks = {}
+        # Different params often trace to the same SVG; keep one copy of each
+        self._svg_intern = {}
+        # Traced SVGs persisted across runs; inputs are deterministic, so a
+        # rerun against unchanged backend code only reads from disk
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        self._disk_cache = shelve.open(os.path.join(OUTPUT_DIR, 'svg_cache'))
+        self._version = backend_version()
+        # SVGs kept for manual inspection, written as one archive at the end
+        self._svg_archive = {}
+
+    def close(self):
+        """Flush and close the on-disk SVG cache"""
+        self._disk_cache.close()
 
     def create_test_image(self, name: str, size=(200, 200)):
         """Create a simple test image for parameter validation"""
@@ -53,19 +91,90 @@ class ParameterTester:
         img.save(img_bytes, format='PNG')
         return img_bytes.getvalue()
 
+    async def _cached_vectorize(self, method: str, image_bytes: bytes, digest: bytes, params: dict) -> str:
+        """Run VectorizerService.<method>_vectorize through the SVG cache"""
+        key = (method, digest, frozenset(params.items()))
+        lock = self._svg_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            if key not in self._svg_cache:
+                disk_key = hashlib.blake2b(
+                    f"{self._version}:{method}:{json.dumps(params, sort_keys=True)}".encode() + digest
+                ).hexdigest()
+                svg = self._disk_cache.get(disk_key)
+                if svg is None:
+                    vectorize = getattr(self.vectorizer, f"{method}_vectorize")
+                    # Potrace reuses the image's PBM across params when given its digest
+                    extra = {'digest': digest} if method == 'potrace' else {}
+                    svg = await vectorize(image_bytes, **extra, **params)
+                    self._disk_cache[disk_key] = svg
+                self._svg_cache[key] = self._svg_intern.setdefault(svg, svg)
+        return self._svg_cache[key]
+
+    async def _run_case(self, label: str, i: int, method: str, test_image: bytes, test_digest: bytes, params: dict, show_params: bool):
+        """Run one test case and return (result dict, line to print)"""
+        prefix = f"{label} test {i+1}: {params} ->" if show_params else f"{label} test {i+1}:"
+        try:
+            svg = await self._cached_vectorize(method, test_image, test_digest, params)
+            hash_val = self.svg_hash(svg)
+            stats = self.extract_svg_stats(svg)
+            result = {
+                'params': params,
+                'hash': hash_val,
+                'stats': stats,
+                'success': True
+            }
+            changed = "" if show_params else " Key params changed ->"
+            return result, f"{prefix}{changed} Hash: {hash_val}, Paths: {stats['path_count']}"
+        except Exception as e:
+            result = {
+                'params': params,
+                'error': str(e),
+                'success': False
+            }
+            return result, f"{prefix} ERROR: {e}"
+
+    async def _run_cases(self, label: str, method: str, test_image: bytes, test_cases: list, show_params: bool = False):
+        """Run independent test cases concurrently, bounded to one per core,
+        then print their lines in case order"""
+        # Overrides that restate a base value produce the same params as
+        # another case; run each distinct combination once
+        seen = set()
+        unique_cases = []
+        for params in test_cases:
+            key = frozenset(params.items())
+            if key in seen:
+                print(f"{label}: skipping duplicate case {params}")
+                continue
+            seen.add(key)
+            unique_cases.append(params)
+        test_cases = unique_cases
+
+        test_digest = image_digest(test_image)
+        semaphore = asyncio.Semaphore(os.cpu_count() or 4)
+
+        async def guarded(i, params):
+            async with semaphore:
+                return await self._run_case(label, i, method, test_image, test_digest, params, show_params)
+
+        outcomes = await asyncio.gather(*[guarded(i, params) for i, params in enumerate(test_cases)])
+        for _, line in outcomes:
+            print(line)
+        return [result for result, _ in outcomes]
+
     def svg_hash(self, svg_content: str) -> str:
         """Generate hash of SVG content to detect differences"""
-        return hashlib.md5(svg_content.encode()).hexdigest()[:8]
+        return f"{zlib.crc32(svg_content.encode()):08x}"
 
     def extract_svg_stats(self, svg_content: str) -> dict:
         """Extract statistics from SVG content for comparison"""
+        counts = Counter(SVG_TOKEN_RE.findall(svg_content))
         stats = {
             'length': len(svg_content),
-            'path_count': svg_content.count('<path'),
-            'move_commands': svg_content.count(' M '),
-            'line_commands': svg_content.count(' L '),
-            'curve_commands': svg_content.count(' C '),
-            'close_commands': svg_content.count(' Z'),
+            'path_count': counts['<path'],
+            'move_commands': counts['M'],
+            'line_commands': counts['L'],
+            'curve_commands': counts['C'],
+            'close_commands': counts['Z'],
         }
         return stats
 
@@ -100,26 +209,7 @@ class ParameterTester:
             {**base_params, 'invert': True},
         ]
 
-        results = []
-        for i, params in enumerate(test_cases):
-            try:
-                svg = await self.vectorizer.potrace_vectorize(test_image, **params)
-                hash_val = self.svg_hash(svg)
-                stats = self.extract_svg_stats(svg)
-                results.append({
-                    'params': params,
-                    'hash': hash_val,
-                    'stats': stats,
-                    'success': True
-                })
-                print(f"Potrace test {i+1}: {params} -> Hash: {hash_val}, Paths: {stats['path_count']}")
-            except Exception as e:
-                results.append({
-                    'params': params,
-                    'error': str(e),
-                    'success': False
-                })
-                print(f"Potrace test {i+1}: {params} -> ERROR: {e}")
+        results = await self._run_cases('Potrace', 'potrace', test_image, test_cases, show_params=True)
 
         # Check for parameter effectiveness
         unique_hashes = set(r['hash'] for r in results if r['success'])
@@ -158,26 +248,7 @@ class ParameterTester:
             {**base_params, 'stroke_width': 5},
         ]
 
-        results = []
-        for i, params in enumerate(test_cases):
-            try:
-                svg = await self.vectorizer.opencv_edge_vectorize(test_image, **params)
-                hash_val = self.svg_hash(svg)
-                stats = self.extract_svg_stats(svg)
-                results.append({
-                    'params': params,
-                    'hash': hash_val,
-                    'stats': stats,
-                    'success': True
-                })
-                print(f"OpenCV Edge test {i+1}: Key params changed -> Hash: {hash_val}, Paths: {stats['path_count']}")
-            except Exception as e:
-                results.append({
-                    'params': params,
-                    'error': str(e),
-                    'success': False
-                })
-                print(f"OpenCV Edge test {i+1}: ERROR: {e}")
+        results = await self._run_cases('OpenCV Edge', 'opencv_edge', test_image, test_cases)
 
         unique_hashes = set(r['hash'] for r in results if r['success'])
         print(f"\nOpenCV Edge Results: {len(unique_hashes)} unique outputs from {len([r for r in results if r['success']])} successful tests")
@@ -208,26 +279,7 @@ class ParameterTester:
             {**base_params, 'epsilon_factor': 0.05},  # Very simplified
         ]
 
-        results = []
-        for i, params in enumerate(test_cases):
-            try:
-                svg = await self.vectorizer.opencv_contour_vectorize(test_image, **params)
-                hash_val = self.svg_hash(svg)
-                stats = self.extract_svg_stats(svg)
-                results.append({
-                    'params': params,
-                    'hash': hash_val,
-                    'stats': stats,
-                    'success': True
-                })
-                print(f"OpenCV Contour test {i+1}: Key params changed -> Hash: {hash_val}, Paths: {stats['path_count']}")
-            except Exception as e:
-                results.append({
-                    'params': params,
-                    'error': str(e),
-                    'success': False
-                })
-                print(f"OpenCV Contour test {i+1}: ERROR: {e}")
+        results = await self._run_cases('OpenCV Contour', 'opencv_contour', test_image, test_cases)
 
         unique_hashes = set(r['hash'] for r in results if r['success'])
         print(f"\nOpenCV Contour Results: {len(unique_hashes)} unique outputs from {len([r for r in results if r['success']])} successful tests")
@@ -251,26 +303,7 @@ class ParameterTester:
             {**base_params, 'min_contour_points': 10},
         ]
 
-        results = []
-        for i, params in enumerate(test_cases):
-            try:
-                svg = await self.vectorizer.opencv_vectorize(test_image, **params)
-                hash_val = self.svg_hash(svg)
-                stats = self.extract_svg_stats(svg)
-                results.append({
-                    'params': params,
-                    'hash': hash_val,
-                    'stats': stats,
-                    'success': True
-                })
-                print(f"OpenCV Basic test {i+1}: Key params changed -> Hash: {hash_val}, Paths: {stats['path_count']}")
-            except Exception as e:
-                results.append({
-                    'params': params,
-                    'error': str(e),
-                    'success': False
-                })
-                print(f"OpenCV Basic test {i+1}: ERROR: {e}")
+        results = await self._run_cases('OpenCV Basic', 'opencv', test_image, test_cases)
 
         unique_hashes = set(r['hash'] for r in results if r['success'])
         print(f"\nOpenCV Basic Results: {len(unique_hashes)} unique outputs from {len([r for r in results if r['success']])} successful tests")
@@ -278,12 +311,18 @@ class ParameterTester:
         return results
 
     def save_test_svg(self, svg_content: str, filename: str):
-        """Save SVG content to file for visual inspection"""
-        os.makedirs('/tmp/vectorizer_test', exist_ok=True)
-        filepath = f'/tmp/vectorizer_test/{filename}'
-        with open(filepath, 'w') as f:
-            f.write(svg_content)
-        return filepath
+        """Queue SVG content for the inspection archive"""
+        self._svg_archive[filename] = svg_content
+        return f'{SVG_ARCHIVE_PATH}/{filename}'
+
+    def flush_svg_archive(self):
+        """Write every queued SVG into one compressed archive"""
+        if not self._svg_archive:
+            return None
+        with zipfile.ZipFile(SVG_ARCHIVE_PATH, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+            for filename, svg_content in self._svg_archive.items():
+                zf.writestr(filename, svg_content)
+        return SVG_ARCHIVE_PATH
 
     async def run_comprehensive_test(self):
         """Run all parameter tests and generate report"""
@@ -302,18 +341,25 @@ class ParameterTester:
         print("=" * 60)
 
         def analyze_results(method_name, results):
-            successful = [r for r in results if r['success']]
-            failed = [r for r in results if not r['success']]
-            unique_hashes = set(r['hash'] for r in successful)
+            # One pass: count successes, collect distinct hashes and failures
+            successful = 0
+            unique_hashes = set()
+            failed = []
+            for r in results:
+                if r['success']:
+                    successful += 1
+                    unique_hashes.add(r['hash'])
+                else:
+                    failed.append(r)
 
             print(f"\n{method_name}:")
             print(f"  Total tests: {len(results)}")
-            print(f"  Successful: {len(successful)}")
+            print(f"  Successful: {successful}")
             print(f"  Failed: {len(failed)}")
             print(f"  Unique outputs: {len(unique_hashes)}")
 
-            if len(successful) > 0:
-                effectiveness = len(unique_hashes) / len(successful) * 100
+            if successful > 0:
+                effectiveness = len(unique_hashes) / successful * 100
                 print(f"  Parameter effectiveness: {effectiveness:.1f}%")
 
                 if effectiveness < 50:
@@ -328,26 +374,20 @@ class ParameterTester:
                 for fail in failed:
                     print(f"    - {fail['params']}: {fail['error']}")
 
-            return len(unique_hashes), len(successful)
+            return len(unique_hashes), successful
 
         total_unique = 0
         total_successful = 0
 
-        unique, successful = analyze_results("POTRACE", potrace_results)
-        total_unique += unique
-        total_successful += successful
-
-        unique, successful = analyze_results("OPENCV EDGE", opencv_edge_results)
-        total_unique += unique
-        total_successful += successful
-
-        unique, successful = analyze_results("OPENCV CONTOUR", opencv_contour_results)
-        total_unique += unique
-        total_successful += successful
-
-        unique, successful = analyze_results("OPENCV BASIC", opencv_basic_results)
-        total_unique += unique
-        total_successful += successful
+        for method_name, results in (
+            ("POTRACE", potrace_results),
+            ("OPENCV EDGE", opencv_edge_results),
+            ("OPENCV CONTOUR", opencv_contour_results),
+            ("OPENCV BASIC", opencv_basic_results),
+        ):
+            unique, successful = analyze_results(method_name, results)
+            total_unique += unique
+            total_successful += successful
 
         print(f"\n" + "=" * 60)
         print("OVERALL ASSESSMENT")
@@ -366,7 +406,8 @@ class ParameterTester:
             print("❌ VERDICT: Major issues with parameter processing - many parameters not working")
 
         # Save sample outputs for manual inspection
-        print(f"\nSample SVG outputs saved to /tmp/vectorizer_test/ for manual inspection")
+        if self.flush_svg_archive():
+            print(f"\nSample SVG outputs saved to {SVG_ARCHIVE_PATH} for manual inspection")
 
         return {
             'potrace': potrace_results,
@@ -378,7 +419,10 @@ class ParameterTester:
 
 async def main():
     tester = ParameterTester()
-    results = await tester.run_comprehensive_test()
+    try:
+        results = await tester.run_comprehensive_test()
+    finally:
+        tester.close()
 
     # Save detailed results
     with open('/tmp/vectorizer_test/parameter_test_results.json', 'w') as f:
@@ -6,9 +6,10 @@ import tempfile
 from typing import Generator, Any
 import pytest
 import numpy as np
-from PIL import Image
+from PIL import Image, ImageDraw
 from fastapi.testclient import TestClient
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
+import main
 from main import app, VectorizerService
 
 
@@ -20,9 +21,19 @@ def event_loop():
     loop.close()
 
 
-@pytest.fixture
+@pytest.fixture(autouse=True)
+def clear_result_cache():
+    """Keep cached SVGs and PBMs from leaking between tests."""
+    main.result_cache.clear()
+    main.pbm_cache.clear()
+    yield
+    main.result_cache.clear()
+    main.pbm_cache.clear()
+
+
+@pytest.fixture(scope="session")
 def client() -> TestClient:
-    """Create a test client for FastAPI app."""
+    """Create a test client for FastAPI app, shared by the whole session."""
     return TestClient(app)
 
 
@@ -32,16 +43,14 @@ def vectorizer_service() -> VectorizerService:
     return VectorizerService()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_image_bytes() -> bytes:
     """Create sample image bytes for testing."""
     # Create a simple black square on white background
-    image = Image.new('RGB', (100, 100), 'white')
+    arr = np.full((100, 100, 3), 255, np.uint8)
     # Add a black rectangle in the middle
-    pixels = image.load()
-    for i in range(25, 75):
-        for j in range(25, 75):
-            pixels[i, j] = (0, 0, 0)
+    arr[25:75, 25:75] = 0
+    image = Image.fromarray(arr, 'RGB')
 
     # Convert to bytes
     buffer = io.BytesIO()
@@ -49,38 +58,50 @@ def sample_image_bytes() -> bytes:
     return buffer.getvalue()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def parameter_image_bytes() -> bytes:
+    """Black square with a white circle, shared by the parameter API tests."""
+    image = Image.new('RGB', (100, 100), color='black')
+    ImageDraw.Draw(image).ellipse([25, 25, 75, 75], fill='white')
+
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+@pytest.fixture(scope="session")
+def tiny_png_bytes() -> bytes:
+    """Smallest valid PNG, for requests the server rejects before tracing."""
+    buffer = io.BytesIO()
+    Image.new('RGB', (1, 1)).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+@pytest.fixture(scope="session")
 def complex_sample_image_bytes() -> bytes:
     """Create a more complex sample image for comprehensive testing."""
     # Create image with multiple shapes and text-like patterns
-    image = Image.new('RGB', (200, 200), 'white')
-    pixels = image.load()
+    arr = np.full((200, 200, 3), 255, np.uint8)
 
     # Black square
-    for i in range(20, 60):
-        for j in range(20, 60):
-            pixels[i, j] = (0, 0, 0)
+    arr[20:60, 20:60] = 0
 
-    # Black circle approximation
-    center_x, center_y = 150, 150
+    # Black circle approximation, within its half-open bounding box
     radius = 25
-    for i in range(center_x - radius, center_x + radius):
-        for j in range(center_y - radius, center_y + radius):
-            if 0 <= i < 200 and 0 <= j < 200:
-                if (i - center_x)**2 + (j - center_y)**2 <= radius**2:
-                    pixels[i, j] = (0, 0, 0)
+    yy, xx = np.ogrid[-radius:radius, -radius:radius]
+    arr[125:175, 125:175][yy**2 + xx**2 <= radius**2] = 0
 
     # Horizontal line
-    for i in range(50, 150):
-        if 0 <= i < 200:
-            pixels[i, 100] = (0, 0, 0)
+    arr[100, 50:150] = 0
+
+    image = Image.fromarray(arr, 'RGB')
 
     buffer = io.BytesIO()
     image.save(buffer, format='PNG')
     return buffer.getvalue()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def empty_image_bytes() -> bytes:
     """Create an empty/white image for testing edge cases."""
     image = Image.new('RGB', (50, 50), 'white')
@@ -89,72 +110,63 @@ def empty_image_bytes() -> bytes:
     return buffer.getvalue()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def text_like_image_bytes() -> bytes:
     """Create an image that looks like text for testing inversion."""
-    image = Image.new('RGB', (150, 50), 'black')  # Black background
-    pixels = image.load()
+    arr = np.zeros((50, 150, 3), np.uint8)  # Black background; arr is [y, x]
 
     # Add white text-like rectangles (simulating white text on black background)
     # Letter "H"
-    for i in range(10, 30):
-        pixels[i, 10] = (255, 255, 255)  # Left vertical line
-        pixels[i, 25] = (255, 255, 255)  # Right vertical line
-    for j in range(10, 26):
-        pixels[20, j] = (255, 255, 255)  # Horizontal line
+    arr[10, 10:30] = 255  # Left vertical line
+    arr[25, 10:30] = 255  # Right vertical line
+    arr[10:26, 20] = 255  # Horizontal line
 
     # Letter "I"
-    for j in range(35, 45):
-        pixels[10, j] = (255, 255, 255)  # Top horizontal line
-        pixels[30, j] = (255, 255, 255)  # Bottom horizontal line
-    for i in range(10, 31):
-        pixels[i, 40] = (255, 255, 255)  # Vertical line
+    arr[35:45, 10] = 255  # Top horizontal line
+    arr[35:45, 30] = 255  # Bottom horizontal line
+    arr[40, 10:31] = 255  # Vertical line
+
+    image = Image.fromarray(arr, 'RGB')
 
     buffer = io.BytesIO()
     image.save(buffer, format='PNG')
     return buffer.getvalue()
 
 
+def _mock_potrace_process(returncode: int, stdout: bytes, stderr: bytes) -> Mock:
+    """Stand-in for the asyncio.subprocess.Process potrace runs in."""
+    proc = Mock(returncode=returncode)
+    proc.communicate = AsyncMock(return_value=(stdout, stderr))
+    return proc
+
+
 @pytest.fixture
 def mock_potrace_success():
     """Mock successful potrace execution."""
-    with patch('subprocess.run') as mock_run:
-        # Mock successful potrace execution
-        mock_run.return_value = Mock(
-            returncode=0,
-            stderr="",
-            stdout=""
-        )
-
-        # Mock file operations
-        with patch('builtins.open', create=True) as mock_open:
-            mock_open.return_value.__enter__.return_value.read.return_value = (
-                '<?xml version="1.0" encoding="UTF-8"?>\n'
-                '<svg xmlns="http://www.w3.org/2000/svg" width="100" height="100">\n'
-                '<path d="M10,10 L90,10 L90,90 L10,90 Z" fill="black"/>\n'
-                '</svg>'
-            )
-
-            with patch('os.path.exists', return_value=True):
-                with patch('os.unlink'):
-                    yield mock_run
+    # The SVG comes back on stdout
+    proc = _mock_potrace_process(
+        0,
+        b'<?xml version="1.0" encoding="UTF-8"?>\n'
+        b'<svg xmlns="http://www.w3.org/2000/svg" width="100" height="100">\n'
+        b'<path d="M10,10 L90,10 L90,90 L10,90 Z" fill="black"/>\n'
+        b'</svg>',
+        b"",
+    )
+    with patch('asyncio.create_subprocess_exec', AsyncMock(return_value=proc)) as mock_exec:
+        yield mock_exec
 
 
 @pytest.fixture
 def mock_potrace_failure():
     """Mock failed potrace execution."""
-    with patch('subprocess.run') as mock_run:
-        mock_run.return_value = Mock(
-            returncode=1,
-            stderr="potrace: error processing file",
-            stdout=""
-        )
-        yield mock_run
+    proc = _mock_potrace_process(1, b"", b"potrace: error processing file")
+    with patch('asyncio.create_subprocess_exec', AsyncMock(return_value=proc)) as mock_exec:
+        yield mock_exec
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_parameters() -> dict:
-    """Sample parameters for testing."""
+    """Sample parameters for testing. Shared by the session; treat as read-only."""
     return {
         "potrace": {
             "invert": False,
@@ -185,26 +197,23 @@ def sample_parameters() -> dict:
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def invalid_image_bytes() -> bytes:
     """Create invalid image bytes for error testing."""
     return b"This is not an image file"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def performance_test_image() -> bytes:
     """Create a larger, more complex image for performance testing."""
-    image = Image.new('RGB', (1000, 1000), 'white')
-    pixels = image.load()
-
-    # Create a complex pattern with multiple shapes
-    for i in range(0, 1000, 50):
-        for j in range(0, 1000, 50):
-            # Create alternating squares
-            if (i + j) % 100 == 0:
-                for x in range(i, min(i + 25, 1000)):
-                    for y in range(j, min(j + 25, 1000)):
-                        pixels[x, y] = (0, 0, 0)
+    arr = np.full((1000, 1000, 3), 255, np.uint8)
+
+    # Create a complex pattern with multiple shapes: a 25px square in the
+    # corner of every other 50px cell
+    i, j = np.mgrid[0:1000, 0:1000]
+    mask = ((i // 50 + j // 50) % 2 == 0) & (i % 50 < 25) & (j % 50 < 25)
+    arr[mask] = 0
+    image = Image.fromarray(arr, 'RGB')
 
     buffer = io.BytesIO()
     image.save(buffer, format='PNG')
@@ -24,10 +24,10 @@ class TestVectorizeEndpoint:
         result = response.json()
 
         assert result["success"] is True
-        assert "original_image" in result
+        assert "original_image" not in result
         assert "vectorized" in result
         assert "parameters_used" in result
-        assert result["original_image"].startswith("data:image/png;base64,")
+        assert len(result["original_hash"]) == 32
 
         # Should contain all vectorization methods
         expected_methods = ["potrace", "opencv_edge", "opencv_contour", "opencv"]
@@ -140,6 +140,16 @@ class TestVectorizeEndpoint:
         assert response.status_code == 400
         assert "File must be an image" in response.json()["detail"]
 
+    @pytest.mark.integration
+    def test_vectorize_mislabeled_image_content(self, client, invalid_image_bytes):
+        """Non-image bytes sent with an image content type are rejected by signature."""
+        files = {"file": ("test.png", io.BytesIO(invalid_image_bytes), "image/png")}
+        data = {"parameters": "{}", "selected_method": "vtracer"}
+
+        response = client.post("/vectorize", files=files, data=data)
+        assert response.status_code == 415
+        assert "not a valid PNG, JPEG, or GIF" in response.json()["detail"]
+
     @pytest.mark.integration
     def test_vectorize_invalid_json_parameters(self, client, sample_image_bytes):
         """Test with invalid JSON parameters."""
@@ -238,7 +248,8 @@ class TestVectorizeEndpoint:
         assert response.status_code == 200
         result = response.json()
         assert result["success"] is True
-        assert result["original_image"].startswith("data:image/jpeg;base64,")
+        assert "original_image" not in result
+        assert len(result["original_hash"]) == 32
 
     @pytest.mark.integration
     def test_vectorize_large_image(self, client, performance_test_image):
@@ -283,6 +294,180 @@ class TestVectorizeEndpoint:
         assert result["parameters_used"]["potrace"]["alphamax"] == 1.5
         assert result["parameters_used"]["opencv_contour"]["invert_threshold"] is True
 
+    @pytest.mark.integration
+    def test_binary_vtracer_skips_potrace(self, client, sample_image_bytes):
+        """Binary vtracer without potrace parameters only runs vtracer."""
+        files = {"file": ("test.png", io.BytesIO(sample_image_bytes), "image/png")}
+        data = {
+            "parameters": json.dumps({"vtracer": {"colormode": "binary"}}),
+            "selected_method": ""
+        }
+
+        response = client.post("/vectorize", files=files, data=data)
+        assert response.status_code == 200
+        assert list(response.json()["vectorized"]) == ["vtracer"]
+
+    @pytest.mark.integration
+    @pytest.mark.parametrize("potrace, expected", [
+        pytest.param(
+            {"invert": False, "turdsize": 2, "turnpolicy": "minority", "alphamax": 1.0, "opticurve": True},
+            ["vtracer"], id="frontend-defaults",
+        ),
+        pytest.param({"turdsize": 10}, ["potrace", "vtracer"], id="customised"),
+    ])
+    def test_binary_vtracer_with_potrace_block(self, client, sample_image_bytes, potrace, expected):
+        """The frontend always sends a potrace block; only non-default values keep potrace."""
+        files = {"file": ("test.png", io.BytesIO(sample_image_bytes), "image/png")}
+        data = {
+            "parameters": json.dumps({
+                "potrace": potrace,
+                "vtracer": {"colormode": "binary", "color_precision": 6, "filter_speckle": 4},
+            }),
+            "selected_method": ""
+        }
+
+        response = client.post("/vectorize", files=files, data=data)
+        assert response.status_code == 200
+        assert sorted(response.json()["vectorized"]) == expected
+
+    @pytest.mark.integration
+    def test_vectorize_raw_svg(self, client, sample_image_bytes):
+        """raw=true with a selected method returns the SVG itself."""
+        files = {"file": ("test.png", io.BytesIO(sample_image_bytes), "image/png")}
+        data = {"parameters": "{}", "selected_method": "vtracer"}
+
+        response = client.post("/vectorize?raw=true", files=files, data=data)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("image/svg+xml")
+        assert response.headers["x-cache"] == "MISS"
+        assert "<svg" in response.text
+
+    @pytest.mark.integration
+    def test_vectorize_raw_requires_method(self, client, sample_image_bytes):
+        """raw=true without a single selected method is rejected."""
+        files = {"file": ("test.png", io.BytesIO(sample_image_bytes), "image/png")}
+        data = {"parameters": "{}", "selected_method": ""}
+
+        response = client.post("/vectorize?raw=true", files=files, data=data)
+        assert response.status_code == 400
+
+class TestResultCache:
+    """Test cases for the traced-SVG result cache."""
+
+    @pytest.mark.integration
+    def test_repeat_request_hits_cache(self, client, sample_image_bytes):
+        """Same image and parameters are served from the cache the second time."""
+        data = {
+            "parameters": json.dumps({"vtracer": {"colormode": "binary"}}),
+            "selected_method": "vtracer"
+        }
+
+        first = client.post("/vectorize", files={"file": ("test.png", io.BytesIO(sample_image_bytes), "image/png")}, data=data)
+        second = client.post("/vectorize", files={"file": ("test.png", io.BytesIO(sample_image_bytes), "image/png")}, data=data)
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert first.json()["cache_hit"] == {"vtracer": False}
+        assert second.json()["cache_hit"] == {"vtracer": True}
+        assert first.json()["vectorized"]["vtracer"] == second.json()["vectorized"]["vtracer"]
+
+    @pytest.mark.integration
+    def test_changed_parameters_miss_cache(self, client, sample_image_bytes):
+        """A parameter change is a different cache entry."""
+        for filter_speckle in (4, 8):
+            data = {
+                "parameters": json.dumps({"vtracer": {"filter_speckle": filter_speckle}}),
+                "selected_method": "vtracer"
+            }
+            response = client.post("/vectorize", files={"file": ("test.png", io.BytesIO(sample_image_bytes), "image/png")}, data=data)
+            assert response.status_code == 200
+            assert response.json()["cache_hit"] == {"vtracer": False}
+
+    @pytest.mark.integration
+    def test_unhashable_extra_parameter(self, client, sample_image_bytes):
+        """Extra keys with list values still produce a cache key."""
+        data = {
+            "parameters": json.dumps({"vtracer": {"foo": [1]}}),
+            "selected_method": "vtracer"
+        }
+        response = client.post("/vectorize", files={"file": ("test.png", io.BytesIO(sample_image_bytes), "image/png")}, data=data)
+
+        assert response.status_code == 200
+        assert "vtracer" in response.json()["vectorized"]
+
+
+class TestDownscaling:
+    """Test cases for the max_edge tracing guard."""
+
+    @pytest.mark.integration
+    def test_large_image_traced_at_max_edge(self, client):
+        """Oversized images are traced small but keep the original viewBox."""
+        from PIL import Image, ImageDraw
+
+        img = Image.new('RGB', (300, 150), 'white')
+        ImageDraw.Draw(img).rectangle([60, 30, 240, 120], fill='black')
+        buffer = io.BytesIO()
+        img.save(buffer, format='PNG')
+
+        files = {"file": ("big.png", io.BytesIO(buffer.getvalue()), "image/png")}
+        data = {"parameters": "{}", "selected_method": "vtracer"}
+
+        response = client.post("/vectorize?max_edge=100", files=files, data=data)
+
+        assert response.status_code == 200
+        svg = response.json()["vectorized"]["vtracer"]
+        assert 'viewBox="0 0 300 150"' in svg
+        assert '<g transform="scale(3 3)">' in svg
+        assert svg.endswith('</g></svg>')
+
+    @pytest.mark.integration
+    def test_small_image_not_wrapped(self, client, sample_image_bytes):
+        """Images within the limit are traced as-is."""
+        files = {"file": ("test.png", io.BytesIO(sample_image_bytes), "image/png")}
+        data = {"parameters": "{}", "selected_method": "vtracer"}
+
+        response = client.post("/vectorize", files=files, data=data)
+
+        assert response.status_code == 200
+        assert 'transform="scale(' not in response.json()["vectorized"]["vtracer"]
+
+
+class TestBatchEndpoint:
+    """Test cases for the /vectorize_batch endpoint."""
+
+    @pytest.mark.integration
+    def test_batch_preserves_order(self, client, sample_image_bytes, complex_sample_image_bytes):
+        """Results come back in upload order, one entry per file."""
+        files = [
+            ("files", ("a.png", io.BytesIO(sample_image_bytes), "image/png")),
+            ("files", ("b.png", io.BytesIO(complex_sample_image_bytes), "image/png")),
+            ("files", ("c.png", io.BytesIO(sample_image_bytes), "image/png")),
+        ]
+        data = {"parameters": json.dumps({"vtracer": {"colormode": "binary"}}), "selected_method": "vtracer"}
+
+        response = client.post("/vectorize_batch", files=files, data=data)
+
+        assert response.status_code == 200
+        result = response.json()
+        assert result["success"] is True
+        assert [item["filename"] for item in result["results"]] == ["a.png", "b.png", "c.png"]
+        for item in result["results"]:
+            assert item["vectorized"]["vtracer"].startswith("<")
+        # Duplicate images in one batch are traced once
+        assert result["results"][0]["vectorized"] == result["results"][2]["vectorized"]
+
+    @pytest.mark.integration
+    def test_batch_rejects_invalid_file_type(self, client, sample_image_bytes):
+        """One unsupported file fails the whole batch with 400."""
+        files = [
+            ("files", ("a.png", io.BytesIO(sample_image_bytes), "image/png")),
+            ("files", ("notes.txt", io.BytesIO(b"not an image"), "text/plain")),
+        ]
+
+        response = client.post("/vectorize_batch", files=files, data={"selected_method": "vtracer"})
+
+        assert response.status_code == 400
+
 
 class TestHealthEndpoint:
     """Test cases for the /health endpoint."""
@@ -314,6 +499,29 @@ class TestCORSHandling:
         # but we can verify the middleware is configured
         assert hasattr(client.app, 'user_middleware')
 
+    @pytest.mark.integration
+    def test_cors_headers_on_error_response(self, client):
+        """HTTPException responses still carry CORS headers for allowed origins."""
+        files = {"file": ("test.txt", io.BytesIO(b"not an image"), "text/plain")}
+        response = client.post(
+            "/vectorize", files=files, data={"parameters": "{}"},
+            headers={"Origin": "http://localhost:5173"}
+        )
+
+        assert response.status_code == 400
+        assert response.headers["access-control-allow-origin"] == "http://localhost:5173"
+
+    @pytest.mark.integration
+    def test_preflight_is_cacheable(self, client):
+        """Preflight responses tell the browser how long to reuse them."""
+        response = client.options("/vectorize", headers={
+            "Origin": "http://localhost:5173",
+            "Access-Control-Request-Method": "POST",
+        })
+
+        assert response.status_code == 200
+        assert response.headers["access-control-max-age"] == "86400"
+
 
 class TestParameterValidation:
     """Test parameter validation and processing."""
@@ -334,10 +542,10 @@ class TestParameterValidation:
             "selected_method": "potrace"
         }
 
-        # Should handle gracefully or return appropriate error
         response = client.post("/vectorize", files=files, data=data)
-        # Might be 200 with error in results or 422/500 depending on validation
-        assert response.status_code in [200, 422, 500]
+        # A method's parameter block must be an object; anything else is a client error
+        assert response.status_code == 400
+        assert "potrace parameters must be an object" in response.json()["detail"]
 
     @pytest.mark.integration
     def test_unknown_method_selection(self, client, sample_image_bytes):
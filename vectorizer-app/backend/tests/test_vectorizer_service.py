@@ -4,6 +4,7 @@ import asyncio
 import cv2
 import numpy as np
 from unittest.mock import Mock, patch, mock_open
+import main
 from main import VectorizerService
 
 
@@ -282,6 +283,69 @@ class TestVectorizerService:
         large_result = await vectorizer_service.opencv_vectorize(large_buffer.getvalue())
         assert is_valid_svg(large_result)
 
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    async def test_potrace_pbm_reused_across_parameter_changes(self, sample_image_bytes):
+        """Retracing the same upload with new trace parameters reuses its PBM."""
+        digest = main.image_digest(sample_image_bytes)
+        first = await main.load_potrace_pbm(sample_image_bytes, False, digest=digest)
+        second = await main.load_potrace_pbm(sample_image_bytes, False, digest=digest)
+
+        assert second is first
+        # Only the PBM and sizes are kept, never the upload itself
+        assert list(main.pbm_cache) == [(digest, False, None)]
+        # Inverting changes the bitmap, so it is built separately
+        inverted = await main.load_potrace_pbm(sample_image_bytes, True, digest=digest)
+        assert inverted[0] != first[0]
+        # Without a digest nothing is cached
+        await main.load_potrace_pbm(sample_image_bytes, False)
+        assert len(main.pbm_cache) == 2
+
+
+class TestNormalizeSvgDimensions:
+    """Test cases for normalize_svg_dimensions."""
+
+    @pytest.mark.unit
+    def test_root_size_replaced_with_viewbox(self, vectorizer_service):
+        """Root width/height are dropped and the viewBox matches the original size."""
+        svg = (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<svg xmlns="http://www.w3.org/2000/svg" width="10pt" height="20pt" viewBox="0 0 10 20">\n'
+            '<path d="M0 0 L5 5 Z" stroke-width="2"/>\n'
+            '</svg>\n'
+        )
+
+        result = vectorizer_service.normalize_svg_dimensions(svg, 100, 200)
+
+        assert 'viewBox="0 0 100 200"' in result
+        assert 'width="10pt"' not in result
+        assert 'height="20pt"' not in result
+        # Inner elements keep their own sizing attributes
+        assert 'stroke-width="2"' in result
+        assert is_valid_svg(result)
+
+    @pytest.mark.unit
+    def test_downscaled_trace_wrapped_in_scale_group(self, vectorizer_service):
+        """A trace made at reduced size is scaled back to the original viewBox."""
+        svg = '<svg xmlns="http://www.w3.org/2000/svg" width="50" height="25"><path d="M0 0"/></svg>'
+
+        result = vectorizer_service.normalize_svg_dimensions(svg, 100, 50, 50, 25)
+
+        assert result == (
+            '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 50">'
+            '<g transform="scale(2 2)"><path d="M0 0"/></g></svg>'
+        )
+
+    @pytest.mark.unit
+    def test_minify_only_trims_attribute_space(self, vectorizer_service):
+        """Space before a closing attribute quote goes; quotes in text content keep theirs."""
+        svg = '<svg xmlns="http://www.w3.org/2000/svg"><path d="M0 0 L5 5 Z "/><text>a "b"</text></svg>'
+
+        result = vectorizer_service.normalize_svg_dimensions(svg, 10, 10)
+
+        assert '<path d="M0 0 L5 5 Z"/>' in result
+        assert '<text>a "b"</text>' in result
+
 
 def is_valid_svg(svg_string: str) -> bool:
     """Check if string is a valid SVG structure."""